@@ -0,0 +1,51 @@
+"""
+Measures how long the command modules take to import, each in a fresh interpreter.
+
+    python benchmarks/import_time.py [--runs 10]
+
+Django itself is imported before the timer starts, as manage.py has always loaded it
+by the time the command module is imported.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "django_unused.management.commands.unused",
+    "django_unused.management.commands._templates",
+    "django_unused.management.commands._views",
+    "django_unused.unused.api",
+    "django_unused.__main__",
+]
+
+TIMER = """
+import time, django.core.management.base
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(module: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", TIMER.format(module=module)],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return float(output.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    options = parser.parse_args()
+
+    for module in MODULES:
+        timings = [time_import(module) for _ in range(options.runs)]
+        print(f"{module:50} {statistics.median(timings) * 1000:8.2f} ms (median of {options.runs})")
+
+
+if __name__ == "__main__":
+    main()
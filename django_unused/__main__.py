@@ -0,0 +1,64 @@
+"""
+Searches for unused templates without setting up Django:
+
+    python -m django_unused templates --settings mysite.settings
+
+Only the settings modules are imported. Their TEMPLATES and app paths are cached on disk
+(see django_unused.unused.cache), so repeated runs skip even that while the settings are unchanged.
+"""
+import argparse
+import os
+import sys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m django_unused")
+    parser.add_argument("unused_type", choices=["templates"], help="What to find")
+    parser.add_argument(
+        "--settings",
+        type=str,
+        nargs="+",
+        default=[os.environ.get("DJANGO_SETTINGS_MODULE")],
+        help="Settings modules to analyse (default: DJANGO_SETTINGS_MODULE)",
+    )
+    parser.add_argument(
+        "--excluded-apps",
+        type=str,
+        nargs="*",
+        help="List of apps to exclude from the search",
+    )
+    parser.add_argument(
+        "--excluded-template-dirs",
+        type=str,
+        nargs="*",
+        help="List of template directories to exclude from the search",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Read the settings modules even if a cached snapshot is up to date",
+    )
+    options = parser.parse_args(argv)
+    if not all(options.settings):
+        parser.error("pass --settings or set DJANGO_SETTINGS_MODULE")
+
+    # Settings modules are imported relative to the current directory, like manage.py does.
+    sys.path.insert(0, os.getcwd())
+
+    from .management.commands._templates import (
+        TemplateFilterOptions,
+        find_unused_templates_in_projects,
+    )
+
+    filter_options = TemplateFilterOptions(
+        excluded_apps=options.excluded_apps,
+        excluded_template_dirs=options.excluded_template_dirs,
+    )
+    results = find_unused_templates_in_projects(
+        options.settings, filter_options, use_cache=not options.no_cache
+    )
+    return 1 if any(r.result.unused_templates for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import os
+from typing import Optional
+
+from colorama import init, Fore
+from django.conf import settings
+
+from ...unused.reference_index import load_reference_index
+from ...unused.remove_templates import (
+    DEFAULT_TRASH_DIR,
+    RemovalPlan,
+    find_stale_files,
+    plan_template_removal,
+    remove_templates,
+    restore_templates,
+)
+from ...unused.search_templates import TemplateFilterOptions
+from ...unused.unused_snapshot import load_unused_snapshot
+from ._templates import fetch_template_search
+
+TEMPLATE_ID_PREFIX = "template:"
+
+
+def delete_unused_templates(
+    snapshot_path: str,
+    baseline_path: str,
+    filter_options: Optional[TemplateFilterOptions] = None,
+    dry_run: bool = False,
+    use_cache: bool = False,
+    trash_dir: Optional[str] = None,
+) -> Optional[RemovalPlan]:
+    """
+    Removes the templates of the snapshot at snapshot_path that the reference index at baseline_path
+    still finds unused. No file is scanned: the index must be newer than every searched file.
+    Returns None, without removing anything, if the snapshot or the index cannot be used
+    or a template cannot be moved. With dry_run, only prints what would be removed.
+    :param trash_dir: Where the batch goes, DEFAULT_TRASH_DIR under BASE_DIR by default.
+    """
+    init(autoreset=True)
+
+    snapshot = load_unused_snapshot(snapshot_path)
+    if snapshot is None:
+        print(f"{Fore.RED}No valid snapshot found at {snapshot_path}.")
+        return None
+    baseline = load_reference_index(baseline_path)
+    if baseline is None:
+        print(f"{Fore.RED}No baseline found at {baseline_path}, run with --save-baseline first.")
+        return None
+
+    setup = fetch_template_search(filter_options, use_cache)
+    stale_files = find_stale_files(setup.file_paths, baseline_path, baseline)
+    if stale_files:
+        print(f"{Fore.RED}{len(stale_files)} files changed since {baseline_path} was saved:")
+        for file_path in stale_files:
+            print(f"{Fore.RED}- {file_path}")
+        print(f"{Fore.RED}Run with --save-baseline again before removing templates.")
+        return None
+
+    base_dir = str(settings.BASE_DIR)
+    candidates = [
+        os.path.normpath(os.path.join(base_dir, item[len(TEMPLATE_ID_PREFIX):]))
+        for item in snapshot.items
+        if item.startswith(TEMPLATE_ID_PREFIX)
+    ]
+    plan = plan_template_removal(candidates, setup.templates, setup.index, baseline)
+
+    for template in plan.still_used:
+        print(f"{Fore.YELLOW}Kept {template.file_path}: it is used now.")
+    for file_path in plan.missing:
+        print(f"{Fore.YELLOW}Skipped {file_path}: it is not a searched template.")
+    if not plan.templates:
+        print(f"{Fore.GREEN}No templates to remove.")
+        return plan
+
+    if dry_run:
+        print(f"{Fore.CYAN}{len(plan.templates)} templates would be removed:")
+        for template in plan.templates:
+            print(f"{Fore.CYAN}- {template.file_path}")
+        return plan
+
+    if trash_dir is None:
+        trash_dir = os.path.join(base_dir, DEFAULT_TRASH_DIR)
+    try:
+        manifest = remove_templates(plan.templates, trash_dir)
+    except OSError as e:
+        print(f"{Fore.RED}Could not remove the templates, none was removed: {e}")
+        return None
+    print(f"{Fore.GREEN}{len(plan.templates)} templates removed:")
+    for template in plan.templates:
+        print(f"{Fore.GREEN}- {template.file_path}")
+    for directory in manifest.directories:
+        print(f"{Fore.GREEN}- {directory}{os.sep}")
+    print(f"{Fore.CYAN}Undo with: python manage.py unused templates --restore {manifest.path}")
+    return plan
+
+
+def restore_removed_templates(manifest_path: str) -> bool:
+    """
+    Returns False if the batch could not be restored.
+    """
+    init(autoreset=True)
+    try:
+        manifest = restore_templates(manifest_path)
+    except (OSError, ValueError) as e:
+        print(f"{Fore.RED}Could not restore {manifest_path}: {e}")
+        return False
+    print(f"{Fore.GREEN}{len(manifest.files)} templates restored from {manifest_path}.")
+    return True
@@ -0,0 +1,66 @@
+import time
+from typing import List
+
+from colorama import init, Fore
+
+from ...unused.find_models import (
+    ModelSearchResult,
+    ModelSymbol,
+    build_symbol_table,
+    find_management_commands,
+    get_project_models,
+    search_unused_model_symbols,
+)
+from ...unused.find_templates import (
+    find_py_files,
+    find_templates_in_loader_order,
+    get_project_app_configs,
+)
+
+
+def print_symbols(title: str, symbols: List[ModelSymbol], none_found: str):
+    if symbols:
+        print(f"\n{Fore.YELLOW}{title}:")
+        for symbol in symbols:
+            location = f" {Fore.RESET}({symbol.file_path})" if symbol.file_path else ""
+            print(f"{Fore.YELLOW}{symbol.label}{location}")
+    else:
+        print(f"\n{Fore.GREEN}{none_found}")
+
+
+def find_unused_models(io_threads: int = 1) -> ModelSearchResult:
+    """
+    Finds the models, model fields and management commands of the project's apps
+    that no Python file or template refers to. Migrations do not count as references.
+    With io_threads above 1, files are read ahead on that many threads.
+    """
+    init(autoreset=True)
+
+    start = time.perf_counter()
+    print(f"{Fore.CYAN}Starting search for unused models...\n")
+
+    app_configs = get_project_app_configs()
+    models = get_project_models(app_configs)
+    commands = find_management_commands(app_configs)
+    table = build_symbol_table(models, commands)
+    print(f"{Fore.GREEN}{len(models)} models and {len(commands)} management commands found.")
+
+    templates = find_templates_in_loader_order(app_configs=app_configs)
+    py_files, _ = find_py_files(app_configs=app_configs)
+    file_paths = py_files + [t.file_path for t in templates]
+    print(f"{Fore.CYAN}Scanning {len(file_paths)} files for model references...")
+    result = search_unused_model_symbols(
+        table, file_paths, {t.file_path for t in templates}, io_threads
+    )
+
+    print_symbols("Unused models", result.unused_models, "No unused models found.")
+    print_symbols("Unused model fields", result.unused_fields, "No unused model fields found.")
+    print_symbols(
+        "Management commands never called from code",
+        result.unused_commands,
+        "All management commands are called from code.",
+    )
+
+    end = time.perf_counter()
+    print(f"\n{Fore.CYAN}Finished in {end - start:.2f} seconds.")
+    return result
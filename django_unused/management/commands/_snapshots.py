@@ -0,0 +1,81 @@
+from typing import Iterable, List, Optional
+
+from colorama import init, Fore
+from django.conf import settings
+
+from ...unused.api import TemplateSearchFinished, ViewSearchFinished
+from ...unused.find_templates import TemplateInfo
+from ...unused.search_templates import TemplateFilterOptions
+from ...unused.unused_snapshot import (
+    SnapshotDiff,
+    build_unused_snapshot,
+    compare_unused_snapshots,
+    get_template_id,
+    get_view_id,
+    load_unused_snapshot,
+    save_unused_snapshot,
+)
+
+
+def get_unused_template_ids(unused_templates: List[TemplateInfo]) -> List[str]:
+    return [get_template_id(t.file_path, str(settings.BASE_DIR)) for t in unused_templates]
+
+
+def get_unused_view_ids(unused_views: Iterable, unrouted_function_views: Iterable) -> List[str]:
+    return [get_view_id(v) for v in list(unused_views) + list(unrouted_function_views)]
+
+
+def search_unused_template_ids(filter_options: Optional[TemplateFilterOptions] = None) -> List[str]:
+    """
+    Runs the template search without printing it.
+    """
+    from ...unused.api import iter_template_search
+
+    for event in iter_template_search(filter_options):
+        if isinstance(event, TemplateSearchFinished):
+            return get_unused_template_ids(event.result.unused_templates)
+    return []
+
+
+def search_unused_view_ids() -> List[str]:
+    """
+    Runs the view search without printing it.
+    """
+    from ...unused.api import iter_view_search
+
+    for event in iter_view_search():
+        if isinstance(event, ViewSearchFinished):
+            return get_unused_view_ids(event.unused_views, event.unrouted_function_views)
+    return []
+
+
+def write_unused_snapshot(path: str, item_ids: Iterable[str]):
+    init(autoreset=True)
+    snapshot = build_unused_snapshot(item_ids)
+    save_unused_snapshot(path, snapshot)
+    print(f"{Fore.CYAN}Snapshot of {len(snapshot.items)} unused items written to {path}.")
+
+
+def compare_with_snapshot(path: str, item_ids: Iterable[str]) -> Optional[SnapshotDiff]:
+    """
+    Prints only the unused items added and removed since the snapshot at path.
+    Returns None if there is no valid snapshot at path.
+    """
+    init(autoreset=True)
+    old_snapshot = load_unused_snapshot(path)
+    if old_snapshot is None:
+        print(f"{Fore.RED}No valid snapshot found at {path}.")
+        return None
+
+    diff = compare_unused_snapshots(old_snapshot, build_unused_snapshot(item_ids))
+    if diff.added:
+        print(f"{Fore.RED}{len(diff.added)} unused items added since {path}:")
+        for item in diff.added:
+            print(f"{Fore.RED}+ {item}")
+    if diff.removed:
+        print(f"{Fore.GREEN}{len(diff.removed)} unused items removed since {path}:")
+        for item in diff.removed:
+            print(f"{Fore.GREEN}- {item}")
+    if not diff.added and not diff.removed:
+        print(f"{Fore.GREEN}No changes since {path}.")
+    return diff
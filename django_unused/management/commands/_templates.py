@@ -1,54 +1,69 @@
-import fileinput
+import os
 import time
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Iterable
+from itertools import chain
+from typing import TYPE_CHECKING, List, Optional, Dict
 
 from colorama import init, Fore
 
+if TYPE_CHECKING:
+    from ...unused.project_cache import ProjectLayout
+    from ...unused.projects import ProjectSnapshot
+    from ...unused.template_graph import TemplateGraph
+
 from ...unused.find_templates import (
-    find_py_files,
-    find_app_templates,
-    find_global_templates,
+    find_templates_in_directories,
+    find_templates_in_loader_order,
     TemplateInfo,
 )
+from ...unused.extractors import determine_reference_type
+from ...unused.scan import iter_scanned_files, scan_files, scan_source
+from ...unused.search_templates import (
+    Reference,
+    TemplateFilterOptions,
+    TemplateSearchResult,
+    TemplateSearchSetup,
+    UsedTemplateInfo,
+    exclude_app_templates,
+    exclude_template_dirs,
+    resolve_references,
+    setup_template_search,
+)
 
 
 @dataclass
-class TemplateFilterOptions:
-    excluded_apps: Optional[Iterable[str]] = None
-    excluded_template_dirs: Optional[Iterable[str]] = None
-
-
-@dataclass
-class Reference:
-    template_info: TemplateInfo
-    line_number: int
-    line: str
-    reference_type: str
-
-
-@dataclass
-class UsedTemplateInfo:
-    template_info: TemplateInfo
-    references: List[Reference]
+class TemplateChangeResult:
+    """
+    How the files changed since rev affect the result stored in a baseline reference index.
+    """
+    rev: str
+    changed_files: List[str]
+    newly_unused_templates: List[TemplateInfo]
+    # The references the changed files had in the baseline and no longer have.
+    removed_references: List[UsedTemplateInfo]
+    result: TemplateSearchResult
 
 
 @dataclass
-class TemplateSearchResult:
-    unused_templates: List[TemplateInfo]
-    used_templates: List[UsedTemplateInfo]
-
-
-def fetch_templates() -> List[TemplateInfo]:
-    print(f"{Fore.CYAN}Fetching global templates...")
-    global_templates = find_global_templates()
-    print(f"{Fore.GREEN}{len(global_templates)} global templates found.\n")
-
-    print(f"{Fore.CYAN}Fetching app templates...")
-    app_templates = find_app_templates()
-    print(f"{Fore.GREEN}{len(app_templates)} app templates found.\n")
+class ProjectSearchResult:
+    settings_module: str
+    result: TemplateSearchResult
+
+
+def fetch_templates(layout: Optional["ProjectLayout"] = None) -> List[TemplateInfo]:
+    """
+    :param layout: The cached template directories to search, instead of working them out from the settings.
+    """
+    print(f"{Fore.CYAN}Fetching templates in loader order...")
+    if layout is None:
+        templates = find_templates_in_loader_order()
+    else:
+        templates = find_templates_in_directories(layout.get_template_dirs())
+    global_template_count = len([t for t in templates if not t.app_config])
+    print(f"{Fore.GREEN}{global_template_count} global templates found.")
+    print(f"{Fore.GREEN}{len(templates) - global_template_count} app templates found.\n")
 
-    return global_templates + app_templates
+    return templates
 
 
 def filter_templates(
@@ -58,12 +73,7 @@ def filter_templates(
 
     # Filter out templates from excluded apps
     if filter_options and filter_options.excluded_apps:
-        excluded_apps_set = set(filter_options.excluded_apps)
-        templates = [
-            t
-            for t in templates
-            if not (t.app_config and t.app_config.name in excluded_apps_set)
-        ]
+        templates = exclude_app_templates(templates, filter_options.excluded_apps)
         filtered_app_template_count = initial_app_template_count - len(
             [t for t in templates if t.app_config]
         )
@@ -75,12 +85,7 @@ def filter_templates(
 
     # Filter out templates from excluded directories
     if filter_options and filter_options.excluded_template_dirs:
-        excluded_dirs_set = set(filter_options.excluded_template_dirs)
-        templates = [
-            t
-            for t in templates
-            if not any(t.template_path.startswith(d) for d in excluded_dirs_set)
-        ]
+        templates = exclude_template_dirs(templates, filter_options.excluded_template_dirs)
         filtered_dir_template_count = initial_template_count - len(templates)
         print(
             f"{Fore.YELLOW}{filtered_dir_template_count} templates excluded by directory filter.\n"
@@ -90,79 +95,247 @@ def filter_templates(
     return templates
 
 
-def determine_reference_type(line: str) -> str:
-    line = line.strip()
-    if "{% include" in line and "%}" in line:
-        return "include"
-    elif "{% extends" in line and "%}" in line:
-        return "extend"
-    else:
-        return "unknown"
+def fetch_template_search(
+    filter_options: Optional[TemplateFilterOptions] = None,
+    use_cache: bool = False,
+    lazy_py_files: bool = False,
+) -> TemplateSearchSetup:
+    """
+    Finds the templates and the Python files of the current project.
+    With use_cache, the project apps and template directories are reused from the last run
+    while the settings are unchanged.
+    With lazy_py_files, the Python files are found while they are being scanned.
+    """
+    layout = None
+    if use_cache:
+        from ...unused.project_cache import load_project_layout
+
+        layout = load_project_layout()
+    return setup_template_search(
+        fetch_templates(layout),
+        filter_options,
+        layout.get_app_configs() if layout else None,
+        exclude=filter_templates,
+        lazy_py_files=lazy_py_files,
+    )
+
+
+def get_head_rev() -> Optional[str]:
+    import subprocess
 
+    from ...unused.git_diff import resolve_rev
 
-def search_unused_templates(templates: List[TemplateInfo]) -> TemplateSearchResult:
-    print(f"{Fore.CYAN}Fetching Python files...")
-    py_files, _ = find_py_files()
-    print(f"{Fore.GREEN}{len(py_files)} Python files found.\n")
+    try:
+        return resolve_rev("HEAD")
+    except (OSError, subprocess.CalledProcessError):
+        return None
 
-    all_files = py_files + [t.file_path for t in templates]
-    unused_templates = []
-    used_templates = []
+
+def search_unused_templates(
+    setup: TemplateSearchSetup,
+    baseline_path: Optional[str] = None,
+    memory_budget: Optional[int] = None,
+    io_threads: int = 1,
+) -> TemplateSearchResult:
+    """
+    If baseline_path is given, the reference index is stored there for later --since runs.
+    If memory_budget is given, files are resolved as they are scanned and reference details beyond
+    that many bytes are spilled to disk, so memory stays flat however large the tree is.
+    The unused templates are the same either way.
+    With io_threads above 1, that many files are read ahead while earlier ones are scanned.
+    """
+    templates, index = setup.templates, setup.index
+    all_files, basenames, backends = setup.file_paths, setup.basenames, setup.backends
+    if isinstance(setup.py_files, list):
+        print(f"{Fore.GREEN}{len(setup.py_files)} Python files found.\n")
 
     print(f"{Fore.CYAN}Searching for unused templates...", end="", flush=True)
-    current_file = None
-    line_number = 0
-    for line in fileinput.input(all_files, openhook=fileinput.hook_encoded("utf-8")):
-        if fileinput.filename() != current_file:
-            current_file = fileinput.filename()
-            line_number = 0
-        line_number += 1
-        for template in templates:
-            if (
-                template.template_path in line
-                or template.template_path.split("/")[-1] in line
-            ):
-                referencing_template = next(
-                    (t for t in templates if t.file_path == current_file), None
-                )
-                if referencing_template:
-                    reference_type = determine_reference_type(
-                        line
-                    )
-                    reference = Reference(
-                        template_info=referencing_template,
-                        line_number=line_number,
-                        line=line.strip(),
-                        reference_type=reference_type,
-                    )
-                    used_template_info = next(
-                        (
-                            uti
-                            for uti in used_templates
-                            if uti.template_info == template
-                        ),
-                        None,
-                    )
-                    if used_template_info:
-                        used_template_info.references.append(reference)
-                    else:
-                        used_templates.append(
-                            UsedTemplateInfo(
-                                template_info=template, references=[reference]
-                            )
-                        )
-
-    fileinput.close()
-
-    for template in templates:
-        if not any(uti.template_info == template for uti in used_templates):
-            unused_templates.append(template)
-
-    return TemplateSearchResult(
-        unused_templates=unused_templates, used_templates=used_templates
+    if memory_budget is None:
+        file_references = scan_files(all_files, basenames, backends, io_threads)
+        if baseline_path:
+            from ...unused.reference_index import save_reference_index
+
+            save_reference_index(baseline_path, file_references, rev=get_head_rev())
+        return resolve_references(templates, index, file_references)
+
+    from ...unused.spill import SpillingReferenceResolver
+
+    resolver = SpillingReferenceResolver(templates, index, memory_budget)
+
+    def scan_and_resolve():
+        for file_path, raw_references in iter_scanned_files(
+            all_files, basenames, backends, io_threads
+        ):
+            resolver.add_file(file_path, raw_references)
+            yield file_path, raw_references
+
+    if baseline_path:
+        from ...unused.reference_index import save_reference_index
+
+        save_reference_index(baseline_path, scan_and_resolve(), rev=get_head_rev())
+    else:
+        for _ in scan_and_resolve():
+            pass
+    return resolver.result()
+
+
+def search_unused_templates_since(
+    setup: TemplateSearchSetup,
+    rev: str,
+    baseline_path: str,
+    io_threads: int = 1,
+) -> Optional[TemplateChangeResult]:
+    """
+    Compares the files as they are now with the files at rev, using the stored reference index
+    for every file that is the same as when the index was saved. Files changed since the index's
+    commit or since rev are rescanned, and the content the files changed since rev had at rev is
+    read from git. The index is then updated to the current files.
+    Returns None if there is no usable baseline at baseline_path.
+    Raises OSError or subprocess.CalledProcessError if git fails, e.g. when rev does not exist.
+    With io_threads above 1, that many changed files are read ahead while earlier ones are scanned.
+    """
+    from ...unused.git_diff import get_changed_files, read_file_at_rev, resolve_rev
+    from ...unused.reference_index import load_reference_index, save_reference_index
+
+    baseline = load_reference_index(baseline_path)
+    # Without its commit, there is no telling which files changed since the index was saved.
+    if baseline is None or not baseline.rev:
+        return None
+    baseline_references = baseline.files
+    baseline_saved_at = os.path.getmtime(baseline_path)
+    resolved_rev = resolve_rev(rev)
+
+    templates, index = setup.templates, setup.index
+    all_files = list(setup.file_paths)
+    basenames, backends = setup.basenames, setup.backends
+
+    def normalize(file_path: str) -> str:
+        return os.path.normpath(os.path.abspath(file_path))
+
+    changed_files = {normalize(f) for f in get_changed_files(rev)}
+    if baseline.rev == resolved_rev:
+        changed_since_baseline = changed_files
+    else:
+        changed_since_baseline = {normalize(f) for f in get_changed_files(baseline.rev)}
+
+    def is_changed(file_path: str) -> bool:
+        return normalize(file_path) in changed_files
+
+    def is_stale(file_path: str) -> bool:
+        # Files edited after the index was saved are rescanned even if git sees no change,
+        # e.g. when the index was saved from uncommitted changes that were reverted since.
+        return (
+            file_path not in baseline_references
+            or is_changed(file_path)
+            or normalize(file_path) in changed_since_baseline
+            or os.path.getmtime(file_path) > baseline_saved_at
+        )
+
+    files_to_scan = [f for f in all_files if is_stale(f)]
+    print(f"{Fore.CYAN}Searching {len(files_to_scan)} changed files...", end="", flush=True)
+    file_references = {
+        f: baseline_references[f] for f in all_files if f in baseline_references
+    }
+    file_references.update(scan_files(files_to_scan, basenames, backends, io_threads))
+    result = resolve_references(templates, index, file_references)
+    save_reference_index(baseline_path, file_references, rev=get_head_rev())
+
+    # The state at rev: unchanged files as they are, changed and deleted files as they were at rev.
+    previous_references = {
+        f: references for f, references in file_references.items() if not is_changed(f)
+    }
+    changed_project_files = [
+        f for f in chain(all_files, baseline_references) if is_changed(f)
+    ]
+    # The index may hold uncommitted content even when it was saved at rev, so git is asked.
+    for file_path in dict.fromkeys(changed_project_files):
+        source = read_file_at_rev(resolved_rev, file_path)
+        if source is not None:
+            previous_references[file_path] = scan_source(
+                source, basenames, backends.get(file_path)
+            )
+    previous_result = resolve_references(templates, index, previous_references)
+
+    previously_unused = {t.file_path for t in previous_result.unused_templates}
+    newly_unused_templates = [
+        t for t in result.unused_templates if t.file_path not in previously_unused
+    ]
+
+    referencing_files = {
+        u.template_info.file_path: {r.file_path for r in u.references}
+        for u in result.used_templates
+    }
+    removed_references = []
+    for used_template in previous_result.used_templates:
+        still_referencing = referencing_files.get(used_template.template_info.file_path, set())
+        references = [
+            r
+            for r in used_template.references
+            if is_changed(r.file_path) and r.file_path not in still_referencing
+        ]
+        if references:
+            removed_references.append(
+                UsedTemplateInfo(template_info=used_template.template_info, references=references)
+            )
+
+    return TemplateChangeResult(
+        rev=rev,
+        changed_files=sorted(changed_files),
+        newly_unused_templates=newly_unused_templates,
+        removed_references=removed_references,
+        result=result,
     )
 
 
+def search_unused_templates_in_projects(
+    snapshots: List["ProjectSnapshot"],
+    filter_options: Optional[TemplateFilterOptions] = None,
+    io_threads: int = 1,
+) -> List[ProjectSearchResult]:
+    """
+    Builds one inventory of the files of all projects and scans each file once,
+    then resolves the references per project.
+    With io_threads above 1, that many files are read ahead while earlier ones are scanned.
+    """
+    projects = []
+    all_files: Dict[str, None] = {}
+    basenames = set()
+    backends: Dict[str, str] = {}
+    for snapshot in snapshots:
+        print(f"{Fore.CYAN}Fetching templates of {snapshot.settings_module}...")
+        setup = setup_template_search(
+            find_templates_in_loader_order(snapshot.template_settings, snapshot.app_configs),
+            filter_options,
+            snapshot.app_configs,
+            exclude=filter_templates,
+        )
+        project_files = list(setup.file_paths)
+        projects.append((snapshot, setup.templates, setup.index, project_files))
+
+        all_files.update(dict.fromkeys(project_files))
+        basenames.update(setup.basenames)
+        backends.update(setup.backends)
+
+    shared_count = sum(len(p[3]) for p in projects) - len(all_files)
+    print(
+        f"{Fore.GREEN}{len(all_files)} files to search, {shared_count} shared between projects.\n"
+    )
+
+    print(f"{Fore.CYAN}Searching for unused templates...", end="", flush=True)
+    file_references = scan_files(all_files, basenames, backends, io_threads)
+
+    results = []
+    for snapshot, templates, index, project_files in projects:
+        project_references = {f: file_references[f] for f in project_files}
+        results.append(
+            ProjectSearchResult(
+                settings_module=snapshot.settings_module,
+                result=resolve_references(templates, index, project_references),
+            )
+        )
+    return results
+
+
 def print_unused_templates(result: TemplateSearchResult):
     print(f"\n{Fore.GREEN}Search complete.\n")
     if result.unused_templates:
@@ -174,24 +347,48 @@ def print_unused_templates(result: TemplateSearchResult):
                 unused_templates_by_app[app_name] = []
             unused_templates_by_app[app_name].append(template)
 
+        shadowed_files = {t.file_path for t in result.shadowed_templates}
         for app_name, templates in unused_templates_by_app.items():
             print(f"\n{Fore.YELLOW}App: {app_name}")
             for template in templates:
-                print(f"{Fore.RED}- {template.template_path}")
+                if template.file_path in shadowed_files:
+                    print(f"{Fore.RED}- {template.template_path} {Fore.YELLOW}(shadowed, never rendered)")
+                else:
+                    print(f"{Fore.RED}- {template.template_path}")
     else:
         print(f"{Fore.GREEN}No unused templates found.")
 
 
+def print_reference(reference: Reference):
+    ambiguity = (
+        f" {Fore.YELLOW}(basename shared by {reference.ambiguity} templates)"
+        if reference.ambiguity > 1
+        else ""
+    )
+    if reference.reference_type == "include":
+        print(
+            f"{Fore.BLUE}  Included in: {Fore.MAGENTA}{reference.source_path} {Fore.BLUE}at line {Fore.MAGENTA}{reference.line_number}{ambiguity}"
+        )
+    elif reference.reference_type == "extend":
+        print(
+            f"{Fore.BLUE}  Extended by: {Fore.MAGENTA}{reference.source_path} {Fore.BLUE}at line {Fore.MAGENTA}{reference.line_number}{ambiguity}"
+        )
+    else:
+        print(
+            f"{Fore.BLUE}  Referenced by ({reference.reference_type}): {Fore.MAGENTA}{reference.source_path} {Fore.BLUE}at line {Fore.MAGENTA}{reference.line_number}{ambiguity}"
+        )
+
+
+def get_app_name(template_info: TemplateInfo) -> str:
+    return template_info.app_config.name if template_info.app_config else "global"
+
+
 def print_used_templates(result: TemplateSearchResult):
     if result.used_templates:
         print(f"\n{Fore.CYAN}Used templates found:")
         used_templates_by_app: Dict[str, List[UsedTemplateInfo]] = {}
         for used_template in result.used_templates:
-            app_name = (
-                used_template.template_info.app_config.name
-                if used_template.template_info.app_config
-                else "global"
-            )
+            app_name = get_app_name(used_template.template_info)
             if app_name not in used_templates_by_app:
                 used_templates_by_app[app_name] = []
             used_templates_by_app[app_name].append(used_template)
@@ -201,37 +398,184 @@ def print_used_templates(result: TemplateSearchResult):
             for used_template in used_templates:
                 print(f"{Fore.CYAN}- {used_template.template_info.template_path}")
                 for reference in used_template.references:
-                    if reference.reference_type == "include":
-                        print(
-                            f"{Fore.BLUE}  Included in: {Fore.MAGENTA}{reference.template_info.template_path} {Fore.BLUE}at line {Fore.MAGENTA}{reference.line_number}"
-                        )
-                    elif reference.reference_type == "extend":
-                        print(
-                            f"{Fore.BLUE}  Extended by: {Fore.MAGENTA}{reference.template_info.template_path} {Fore.BLUE}at line {Fore.MAGENTA}{reference.line_number}"
-                        )
-                    else:
-                        print(
-                            f"{Fore.BLUE}  Referenced by ({reference.reference_type}): {Fore.MAGENTA}{reference.template_info.template_path} {Fore.BLUE}at line {Fore.MAGENTA}{reference.line_number}"
-                        )
+                    print_reference(reference)
                 print()
     else:
         print(f"{Fore.GREEN}No used templates found.")
 
 
+def print_used_templates_in_order(result: TemplateSearchResult):
+    """
+    Like print_used_templates, for used templates that already come grouped by app,
+    so that only one template's references are held at a time.
+    """
+    if result.used_templates:
+        print(f"\n{Fore.CYAN}Used templates found:")
+        current_app_name = None
+        for used_template in result.used_templates:
+            app_name = get_app_name(used_template.template_info)
+            if app_name != current_app_name:
+                print(f"\n{Fore.YELLOW}App: {app_name}")
+                current_app_name = app_name
+            print(f"{Fore.CYAN}- {used_template.template_info.template_path}")
+            for reference in used_template.references:
+                print_reference(reference)
+            print()
+    else:
+        print(f"{Fore.GREEN}No used templates found.")
+
+
+def print_template_changes(changes: TemplateChangeResult):
+    print(f"\n{Fore.GREEN}Search complete.\n")
+    if changes.newly_unused_templates:
+        print(f"{Fore.RED}Templates unused since {changes.rev}:")
+        for template in changes.newly_unused_templates:
+            print(f"{Fore.RED}- {template.template_path}")
+    else:
+        print(f"{Fore.GREEN}No templates became unused since {changes.rev}.")
+
+    if changes.removed_references:
+        print(f"\n{Fore.YELLOW}References removed since {changes.rev}:")
+        for used_template in changes.removed_references:
+            print(f"{Fore.CYAN}- {used_template.template_info.template_path}")
+            for reference in used_template.references:
+                print(
+                    f"{Fore.BLUE}  No longer referenced by: {Fore.MAGENTA}{reference.source_path}"
+                )
+
+
+def print_template_graph(graph: "TemplateGraph"):
+    unused_blocks = [b for b in graph.block_overrides if b.unused_blocks]
+    if unused_blocks:
+        print(f"\n{Fore.RED}Blocks no child template overrides:")
+        for block_overrides in unused_blocks:
+            print(f"{Fore.YELLOW}- {block_overrides.template_info.template_path}")
+            for name in block_overrides.unused_blocks:
+                print(f"{Fore.RED}  {name}")
+    else:
+        print(f"\n{Fore.GREEN}All blocks of extended templates are overridden.")
+
+    if graph.dead_templates:
+        print(f"\n{Fore.RED}Templates only referenced through unused templates:")
+        for template in graph.dead_templates:
+            print(f"{Fore.RED}- {template.template_path}")
+    else:
+        print(f"\n{Fore.GREEN}No templates are only referenced through unused templates.")
+
+
 def find_unused_templates(
     filter_options: Optional[TemplateFilterOptions] = None,
+    baseline_path: Optional[str] = None,
+    graph: bool = False,
+    memory_budget: Optional[int] = None,
+    use_cache: bool = False,
+    io_threads: int = 1,
 ) -> TemplateSearchResult:
+    """
+    With graph, also reports the blocks no child overrides
+    and the templates that are only referenced through unused templates.
+    With memory_budget, reference details beyond that many bytes are spilled to disk.
+    With use_cache, the project apps and template directories are reused from the last run
+    while the settings are unchanged.
+    With io_threads above 1, files are read ahead on that many threads.
+    """
     init(autoreset=True)
 
     start = time.perf_counter()
     print(f"{Fore.CYAN}Starting search for unused templates...\n")
 
-    templates = fetch_templates()
-    templates = filter_templates(templates, filter_options)
-    result = search_unused_templates(templates)
+    setup = fetch_template_search(filter_options, use_cache, lazy_py_files=io_threads > 1)
+    result = search_unused_templates(setup, baseline_path, memory_budget, io_threads)
     print_unused_templates(result)
-    print_used_templates(result)
+    if memory_budget is None:
+        print_used_templates(result)
+    else:
+        print_used_templates_in_order(result)
+    if graph:
+        from ...unused.template_graph import analyse_template_graph
+
+        print_template_graph(analyse_template_graph(result))
 
     end = time.perf_counter()
     print(f"\n{Fore.CYAN}Finished in {end - start:.2f} seconds.")
     return result
+
+
+def find_unused_templates_since(
+    rev: str,
+    baseline_path: str,
+    filter_options: Optional[TemplateFilterOptions] = None,
+    use_cache: bool = False,
+    io_threads: int = 1,
+) -> Optional[TemplateChangeResult]:
+    """
+    Reports the templates that the files changed since rev made unused, using the reference index
+    stored at baseline_path. Without a baseline, a full search is run and stored there first.
+    Returns None if git cannot compare with rev, e.g. outside a checkout or for an unknown rev.
+    With use_cache, the project apps and template directories are reused from the last run
+    while the settings are unchanged.
+    With io_threads above 1, files are read ahead on that many threads.
+    """
+    import subprocess
+
+    from ...unused.git_diff import resolve_rev
+
+    init(autoreset=True)
+
+    start = time.perf_counter()
+    print(f"{Fore.CYAN}Starting search for templates made unused since {rev}...\n")
+
+    setup = fetch_template_search(filter_options, use_cache)
+    try:
+        resolve_rev(rev)
+        changes = search_unused_templates_since(setup, rev, baseline_path, io_threads)
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", None)
+        print(f"{Fore.RED}Could not compare with {rev}: {(stderr or str(e)).strip()}")
+        return None
+    if changes is None:
+        print(f"{Fore.YELLOW}No usable baseline found at {baseline_path}, searching all files.\n")
+        result = search_unused_templates(setup, baseline_path, io_threads=io_threads)
+        changes = TemplateChangeResult(
+            rev=rev,
+            changed_files=[],
+            newly_unused_templates=result.unused_templates,
+            removed_references=[],
+            result=result,
+        )
+    print_template_changes(changes)
+
+    end = time.perf_counter()
+    print(f"\n{Fore.CYAN}Finished in {end - start:.2f} seconds.")
+    return changes
+
+
+def find_unused_templates_in_projects(
+    settings_modules: List[str],
+    filter_options: Optional[TemplateFilterOptions] = None,
+    use_cache: bool = False,
+    io_threads: int = 1,
+) -> List[ProjectSearchResult]:
+    """
+    Searches several projects, reading their settings modules without django.setup().
+    Only templates are searched; views need each project's URLconf, which needs django.setup().
+    With use_cache, the settings snapshots are reused from disk while the settings files are unchanged.
+    With io_threads above 1, files are read ahead on that many threads.
+    """
+    from ...unused.projects import load_cached_project_snapshot, load_project_snapshot
+
+    init(autoreset=True)
+
+    start = time.perf_counter()
+    print(f"{Fore.CYAN}Starting search for unused templates in {len(settings_modules)} projects...\n")
+
+    load_snapshot = load_cached_project_snapshot if use_cache else load_project_snapshot
+    snapshots = [load_snapshot(m) for m in settings_modules]
+    results = search_unused_templates_in_projects(snapshots, filter_options, io_threads)
+    for project_result in results:
+        print(f"\n{Fore.YELLOW}Project: {project_result.settings_module}")
+        print_unused_templates(project_result.result)
+
+    end = time.perf_counter()
+    print(f"\n{Fore.CYAN}Finished in {end - start:.2f} seconds.")
+    return results
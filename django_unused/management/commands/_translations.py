@@ -0,0 +1,64 @@
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from colorama import init, Fore
+
+from ...unused.find_templates import (
+    find_py_files,
+    find_templates_in_loader_order,
+    get_project_app_configs,
+)
+from ...unused.find_translations import (
+    MessageKey,
+    PoEntry,
+    TranslationSearchResult,
+    find_po_files,
+    search_unused_translations,
+)
+
+
+def print_unused_translations(result: TranslationSearchResult):
+    # An unused msgid is usually present in every locale, so it is listed once with its catalogs.
+    entries_by_key: Dict[MessageKey, List[PoEntry]] = defaultdict(list)
+    for entry in result.unused_entries:
+        entries_by_key[entry.key].append(entry)
+
+    if entries_by_key:
+        print(f"\n{Fore.YELLOW}{len(entries_by_key)} unused translation strings:")
+        for (msgctxt, msgid), entries in entries_by_key.items():
+            context = f" {Fore.RESET}(context: {msgctxt})" if msgctxt else ""
+            print(f"{Fore.YELLOW}{msgid!r}{context}")
+            for entry in entries:
+                print(f"  {entry.file_path}:{entry.line_number}")
+    else:
+        print(f"\n{Fore.GREEN}No unused translation strings found.")
+
+
+def find_unused_translations(io_threads: int = 1) -> TranslationSearchResult:
+    """
+    Finds the msgids in the project's django.po files that no Python file or template uses.
+    With io_threads above 1, files are read ahead on that many threads.
+    """
+    init(autoreset=True)
+
+    start = time.perf_counter()
+    print(f"{Fore.CYAN}Starting search for unused translation strings...\n")
+
+    app_configs = get_project_app_configs()
+    po_files = find_po_files(app_configs)
+    print(f"{Fore.GREEN}{len(po_files)} .po files found.")
+
+    templates = find_templates_in_loader_order(app_configs=app_configs)
+    py_files, _ = find_py_files(app_configs=app_configs)
+    file_paths = py_files + [t.file_path for t in templates]
+    print(f"{Fore.CYAN}Scanning {len(file_paths)} files for translation strings...")
+
+    result = search_unused_translations(
+        po_files, file_paths, {t.file_path: t.backend for t in templates}, io_threads
+    )
+    print_unused_translations(result)
+
+    end = time.perf_counter()
+    print(f"\n{Fore.CYAN}Finished in {end - start:.2f} seconds.")
+    return result
@@ -1,15 +1,29 @@
 from __future__ import print_function
 
 import time
+from typing import Optional
 
-from ...unused.find_views import get_view_files, get_views, get_url_view_names
+from colorama import init, Fore
 
+from ...unused.find_templates import find_py_files, find_templates_in_directories
+from ...unused.find_urls import find_unused_url_patterns, find_used_url_names
+from ...unused.find_views import (
+    get_view_files,
+    get_views,
+    get_function_views,
+    is_unrouted_function_view,
+    is_unused_view,
+)
+from ...unused.project_cache import Routing, load_project_layout, load_routing
 
-def find_unused_views():
+
+def find_unused_views(use_cache: bool = False, routing: Optional[Routing] = None):
     """
     Finds all views in the project. The criteria for an unused view are:
         1. It is not used in any URL.
         2. It is not subclassed by any other view.
+    With use_cache, the URL tree is only imported when the settings or a urlconf changed since the last run.
+    :param routing: The URL tree, if it has been loaded already.
     """
     start = time.perf_counter()
     print("Finding all unused views...")
@@ -18,25 +32,16 @@ def find_unused_views():
     print(" Searching for references of each view...", end="")  # , flush=True)
     # Get each view
     views = get_views(view_file_paths)
-    # Get the names of the views used in URLs
-    url_view_names = get_url_view_names()
+    # Get the views used in URLs
+    if routing is None:
+        routing = load_routing(use_cache)
+    routed_view_paths = routing.routed_view_paths
 
     # Find each unused view
     unused_views = []
     for view in views:
         print(".", end="")  # , flush=True)
-
-        # If a view is not decorated with used_view, not called by a url and is not subclassed, it is unused.
-        # Pulling view.__subclasses__() out of the other loop made it find all classes which subclassed view...
-        #   probably something to do with namespacing.
-        if (
-            not hasattr(view, "is_used")
-            and view.__name__ not in url_view_names
-            and not view.__subclasses__()
-        ):
-            unused_views.append(view)
-        # Cover the odd case where the view has is_used == False
-        elif hasattr(view, "is_used") and not view.is_used:
+        if is_unused_view(view, routed_view_paths):
             unused_views.append(view)
 
     print("\nDone")
@@ -46,3 +51,46 @@ def find_unused_views():
     end = time.perf_counter()
     print("Finished in " + str(end - start) + " seconds.")
     return unused_views
+
+
+def find_unused_urls(use_cache: bool = False, routing: Optional[Routing] = None):
+    """
+    Finds the function-based views no URL pattern routes to,
+    and the named URL patterns that are never reversed in Python code or templates.
+    With use_cache, the URL tree and the template directories are read from the cache when still valid.
+    :param routing: The URL tree, if it has been loaded already.
+    """
+    init(autoreset=True)
+    start = time.perf_counter()
+    print(f"{Fore.CYAN}Walking the URL patterns...")
+    if routing is None:
+        routing = load_routing(use_cache)
+    url_patterns = routing.url_patterns
+    routed_view_paths = routing.routed_view_paths
+    print(f"{Fore.GREEN}{len(url_patterns)} URL patterns found.\n")
+
+    function_views = get_function_views(get_view_files())
+    unrouted_views = [
+        v for v in function_views if is_unrouted_function_view(v, routed_view_paths)
+    ]
+
+    url_names = {p.name for p in url_patterns if p.name}
+    layout = load_project_layout(use_cache)
+    py_files, _ = find_py_files(app_configs=layout.get_app_configs())
+    templates = find_templates_in_directories(layout.get_template_dirs())
+    file_paths = py_files + [t.file_path for t in templates]
+    backends = {t.file_path: t.backend for t in templates}
+    print(f"{Fore.CYAN}Scanning {len(file_paths)} files for URL names...")
+    unused_url_patterns = find_unused_url_patterns(
+        url_patterns, find_used_url_names(url_names, file_paths, backends)
+    )
+
+    print(f"\n{Fore.YELLOW}Unrouted function-based views:")
+    for view in unrouted_views:
+        print(f"{Fore.YELLOW}{view.__module__}.{view.__name__}")
+    print(f"\n{Fore.YELLOW}Unused URL names:")
+    for url_pattern in unused_url_patterns:
+        print(f"{Fore.YELLOW}{url_pattern.name} {Fore.RESET}({url_pattern.pattern})")
+    end = time.perf_counter()
+    print(f"{Fore.GREEN}Finished in {end - start:.2f} seconds.")
+    return unrouted_views, unused_url_patterns
@@ -1,13 +1,50 @@
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 from typing import Any
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
-from ._templates import find_unused_templates, TemplateFilterOptions
+# Each mode imports its own machinery in its handler, so running one mode does not load the others.
+
+# The options a --settings-modules run cannot combine with, as they need a single project.
+SINGLE_PROJECT_OPTIONS = [
+    "since",
+    "save_baseline",
+    "graph",
+    "memory_budget",
+    "write_snapshot",
+    "compare",
+    "delete",
+    "restore",
+]
+
+# The options a --since run cannot combine with: it always refreshes the baseline, and only
+# reports what changed since the revision.
+SINCE_OPTIONS = [
+    "save_baseline",
+    "graph",
+    "memory_budget",
+    "write_snapshot",
+    "compare",
+    "delete",
+    "restore",
+]
+
+
+def positive_int(value: str) -> int:
+    """
+    An argparse type for counts and sizes that must be at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"invalid int value: {value!r}")
+    if number <= 0:
+        raise ArgumentTypeError(f"must be a positive number: {value!r}")
+    return number
 
 
 class Command(BaseCommand):
-    help = "Lists all unused template files."
+    help = "Lists all unused template files, views, translation strings, or models."
 
     def add_arguments(self, parser: ArgumentParser) -> None:
         parser.add_argument(
@@ -15,8 +52,8 @@ class Command(BaseCommand):
             type=str,
             nargs="?",
             default="templates",
-            choices=["templates"],
-            help="What to find: templates (default), views, media",
+            choices=["templates", "views", "translations", "models"],
+            help="What to find: templates (default), views, translations, models, media",
         )
         parser.add_argument(
             "--excluded-apps",
@@ -30,24 +67,246 @@ class Command(BaseCommand):
             nargs="*",
             help="List of template directories to exclude from the search",
         )
+        parser.add_argument(
+            "--graph",
+            action="store_true",
+            help="Also list blocks no child template overrides and templates only used by unused templates",
+        )
+        parser.add_argument(
+            "--settings-modules",
+            type=str,
+            nargs="+",
+            help="Analyse several projects sharing apps in one run, e.g. site_a.settings site_b.settings",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            help="Only report templates made unused by the files changed since this git revision",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=str,
+            help="Reference index used by --since (default: .django-unused-baseline.json)",
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store the reference index of a full search at --baseline",
+        )
+        parser.add_argument(
+            "--write-snapshot",
+            type=str,
+            metavar="PATH",
+            help="Store the sorted IDs of this run's unused templates or views at PATH",
+        )
+        parser.add_argument(
+            "--compare",
+            type=str,
+            metavar="SNAPSHOT",
+            help="Only print the unused items added and removed since SNAPSHOT; fail only on added items",
+        )
+        parser.add_argument(
+            "--delete",
+            type=str,
+            metavar="SNAPSHOT",
+            help="Remove the unused templates of SNAPSHOT that the --baseline index still finds unused",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="With --delete, only print the templates that would be removed",
+        )
+        parser.add_argument(
+            "--restore",
+            type=str,
+            metavar="MANIFEST",
+            help="Put back the templates removed by --delete, using the manifest it printed",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Do not reuse the apps, template directories and URL patterns found by earlier runs",
+        )
+        parser.add_argument(
+            "--io-threads",
+            type=positive_int,
+            default=1,
+            help="Read this many files ahead on a thread pool, e.g. on network filesystems (default: 1)",
+        )
+        parser.add_argument(
+            "--memory-budget",
+            type=positive_int,
+            help="Keep at most this many MB of reference details in memory and spill the rest to disk",
+        )
 
     def handle(self, *args: Any, **options: dict[str, Any]):
         unused_type = options["unused_type"]
+        if options.get("settings_modules"):
+            self.check_multi_project_options(unused_type, options)
+        if options.get("dry_run") and not options.get("delete"):
+            raise CommandError("--dry-run only applies to --delete.")
+
+        if unused_type == "templates":
+            self.handle_templates(options)
+        elif unused_type == "views":
+            self.handle_views(options)
+        elif unused_type == "translations":
+            self.handle_translations(options)
+        elif unused_type == "models":
+            self.handle_models(options)
+        else:
+            self.stderr.write(
+                self.style.ERROR(
+                    f"{unused_type} is not a valid parameter. Valid parameters are templates, views, translations, models, and media."
+                )
+            )
+            exit(1)
+
+    def check_multi_project_options(self, unused_type: str, options: dict[str, Any]):
+        if unused_type != "templates":
+            raise CommandError("--settings-modules only searches for unused templates.")
+        self.reject_options("--settings-modules", SINGLE_PROJECT_OPTIONS, options)
+
+    def reject_options(self, option: str, names: list[str], options: dict[str, Any]):
+        """
+        Raises CommandError if any of the options called names is given along with option.
+        """
+        used_options = [
+            f"--{name.replace('_', '-')}" for name in names if options.get(name) not in (None, False)
+        ]
+        if used_options:
+            raise CommandError(f"{option} cannot be combined with {', '.join(used_options)}.")
+
+    def handle_templates(self, options: dict[str, Any]):
+        from ._templates import (
+            find_unused_templates,
+            find_unused_templates_in_projects,
+            find_unused_templates_since,
+            TemplateFilterOptions,
+        )
         excluded_apps = options.get("excluded_apps")
         excluded_template_dirs = options.get("excluded_template_dirs")
+        settings_modules = options.get("settings_modules")
+        since = options.get("since")
+        use_cache = not options.get("no_cache")
+        memory_budget = options.get("memory_budget")
+        if memory_budget is not None:
+            memory_budget *= 1024 * 1024
+        baseline_path = options.get("baseline")
+        if baseline_path is None:
+            from ...unused.reference_index import DEFAULT_BASELINE_PATH
+
+            baseline_path = DEFAULT_BASELINE_PATH
 
         filter_options = TemplateFilterOptions(
             excluded_apps=excluded_apps, excluded_template_dirs=excluded_template_dirs
         )
+        if since:
+            self.reject_options("--since", SINCE_OPTIONS, options)
 
-        if unused_type == "templates":
-            unused_templates = find_unused_templates(filter_options)
-            if unused_templates:
+        if options.get("restore"):
+            from ._delete import restore_removed_templates
+
+            if not restore_removed_templates(options["restore"]):
+                exit(1)
+        elif options.get("delete"):
+            from ._delete import delete_unused_templates
+
+            plan = delete_unused_templates(
+                options["delete"],
+                baseline_path,
+                filter_options,
+                dry_run=options.get("dry_run", False),
+                use_cache=use_cache,
+            )
+            if plan is None:
+                exit(1)
+        elif options.get("compare"):
+            from ._snapshots import search_unused_template_ids
+
+            self.compare_with_snapshot(options, search_unused_template_ids(filter_options))
+        elif settings_modules:
+            results = find_unused_templates_in_projects(
+                settings_modules,
+                filter_options,
+                use_cache=use_cache,
+                io_threads=options.get("io_threads", 1),
+            )
+            if any(r.result.unused_templates for r in results):
+                exit(1)
+        elif since:
+            changes = find_unused_templates_since(
+                since,
+                baseline_path,
+                filter_options,
+                use_cache=use_cache,
+                io_threads=options.get("io_threads", 1),
+            )
+            if changes is None or changes.newly_unused_templates:
                 exit(1)
         else:
-            self.stderr.write(
-                self.style.ERROR(
-                    f"{unused_type} is not a valid parameter. Valid parameters are templates, views, and media."
+            result = find_unused_templates(
+                filter_options,
+                baseline_path if options.get("save_baseline") else None,
+                graph=options.get("graph", False),
+                memory_budget=memory_budget,
+                use_cache=use_cache,
+                io_threads=options.get("io_threads", 1),
+            )
+            if options.get("write_snapshot"):
+                from ._snapshots import get_unused_template_ids, write_unused_snapshot
+
+                write_unused_snapshot(
+                    options["write_snapshot"], get_unused_template_ids(result.unused_templates)
                 )
+            if result.unused_templates:
+                exit(1)
+
+    def handle_views(self, options: dict[str, Any]):
+        from ._views import find_unused_urls, find_unused_views
+
+        if options.get("compare"):
+            from ._snapshots import search_unused_view_ids
+
+            self.compare_with_snapshot(options, search_unused_view_ids())
+            return
+
+        from ...unused.project_cache import load_routing
+
+        use_cache = not options.get("no_cache")
+        # Both searches share one walk of the URL tree.
+        routing = load_routing(use_cache)
+        unused_views = find_unused_views(use_cache, routing)
+        unrouted_views, unused_url_patterns = find_unused_urls(use_cache, routing)
+        if options.get("write_snapshot"):
+            from ._snapshots import get_unused_view_ids, write_unused_snapshot
+
+            write_unused_snapshot(
+                options["write_snapshot"], get_unused_view_ids(unused_views, unrouted_views)
             )
+        if unused_views or unrouted_views or unused_url_patterns:
+            exit(1)
+
+    def compare_with_snapshot(self, options: dict[str, Any], item_ids: list[str]):
+        from ._snapshots import compare_with_snapshot, write_unused_snapshot
+
+        diff = compare_with_snapshot(options["compare"], item_ids)
+        if options.get("write_snapshot"):
+            write_unused_snapshot(options["write_snapshot"], item_ids)
+        # Only newly unused items fail the run, so existing dead code does not block CI.
+        if diff is None or diff.added:
+            exit(1)
+
+    def handle_translations(self, options: dict[str, Any]):
+        from ._translations import find_unused_translations
+
+        if find_unused_translations(options.get("io_threads", 1)).unused_entries:
+            exit(1)
+
+    def handle_models(self, options: dict[str, Any]):
+        from ._models import find_unused_models
+
+        result = find_unused_models(options.get("io_threads", 1))
+        # Commands are usually run by hand or by cron, so they are reported without failing.
+        if result.unused_models or result.unused_fields:
             exit(1)
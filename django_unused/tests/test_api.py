@@ -0,0 +1,116 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from django_unused.unused.api import (
+    FileScanned,
+    FilesFound,
+    TemplateSearchFinished,
+    TemplatesFound,
+    aiter_events,
+    iter_template_search,
+)
+from django_unused.unused.find_templates import TemplateInfo
+
+
+class TestIterTemplateSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.view_file = self.write("views.py", "template_name = 'app1/page.html'\n")
+        self.page = TemplateInfo(
+            self.write("templates/app1/page.html", "{% include 'app1/unused.html' %}"),
+            "app1/page.html",
+            None,
+        )
+        self.unused = TemplateInfo(
+            self.write("templates/app1/unused.html", ""), "app1/unused.html", None
+        )
+        self.orphan = TemplateInfo(
+            self.write("templates/app1/orphan.html", ""), "app1/orphan.html", None
+        )
+        templates = [self.page, self.unused, self.orphan]
+        patchers = [
+            patch(
+                "django_unused.unused.api.find_templates_in_loader_order",
+                return_value=templates,
+            ),
+            patch(
+                "django_unused.unused.search_templates.find_py_files",
+                return_value=([self.view_file], ["views.py"]),
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_events(self):
+        events = list(iter_template_search())
+        self.assertEqual(
+            [type(e) for e in events],
+            [TemplatesFound, FilesFound] + [FileScanned] * 4 + [TemplateSearchFinished],
+        )
+        self.assertEqual(events[2].newly_used_templates, [self.page])
+        self.assertEqual(events[3].newly_used_templates, [self.unused])
+        self.assertEqual(events[-1].result.unused_templates, [self.orphan])
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        events = []
+        for event in iter_template_search(cancel=cancel):
+            events.append(event)
+            if isinstance(event, FileScanned):
+                cancel.set()
+        self.assertEqual([type(e) for e in events], [TemplatesFound, FilesFound, FileScanned])
+
+
+class TestAiterEvents(unittest.TestCase):
+
+    def test_yields_events_and_cancels_on_close(self):
+        cancels = []
+
+        def iter_numbers(count, cancel):
+            cancels.append(cancel)
+            for number in range(count):
+                if cancel.is_set():
+                    return
+                yield number
+
+        async def consume():
+            numbers = []
+            events = aiter_events(iter_numbers, 10)
+            async for number in events:
+                numbers.append(number)
+                if number == 2:
+                    break
+            await events.aclose()
+            return numbers
+
+        self.assertEqual(asyncio.run(consume()), [0, 1, 2])
+        self.assertTrue(cancels[0].is_set())
+
+    def test_exhausts_iterator(self):
+        def iter_numbers(cancel):
+            yield from range(3)
+
+        async def consume():
+            return [n async for n in aiter_events(iter_numbers)]
+
+        self.assertEqual(asyncio.run(consume()), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
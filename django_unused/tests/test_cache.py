@@ -0,0 +1,215 @@
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django_unused.unused.cache import (
+    CACHE_DIR_ENV,
+    fingerprint_files,
+    read_cache,
+    write_cache,
+)
+from django_unused.unused import project_cache
+from django_unused.unused.find_urls import UrlPatternInfo
+from django_unused.unused.projects import (
+    load_cached_project_snapshot,
+    snapshot_template_settings,
+)
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {CACHE_DIR_ENV: os.path.join(self.tmp_dir.name, "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_read_with_same_key(self):
+        write_cache("test", "key1", {"a": [1, 2]})
+        self.assertEqual(read_cache("test", "key1"), {"a": [1, 2]})
+        self.assertIsNone(read_cache("test", "key2"))
+        self.assertIsNone(read_cache("missing", "key1"))
+
+    def test_fingerprint_changes_with_file(self):
+        path = os.path.join(self.tmp_dir.name, "settings.py")
+        with open(path, "w") as f:
+            f.write("A = 1\n")
+        before = fingerprint_files([path])
+        with open(path, "w") as f:
+            f.write("A = 22\n")
+        self.assertNotEqual(fingerprint_files([path]), before)
+        self.assertNotEqual(fingerprint_files([path + ".missing"]), before)
+
+    def test_cached_project_snapshot(self):
+        project_dir = os.path.join(self.tmp_dir.name, "project")
+        os.makedirs(os.path.join(project_dir, "snapshot_app"))
+        open(os.path.join(project_dir, "snapshot_app", "__init__.py"), "w").close()
+        settings_path = os.path.join(project_dir, "snapshot_settings.py")
+        with open(settings_path, "w") as f:
+            f.write(textwrap.dedent(f"""
+                BASE_DIR = {project_dir!r}
+                INSTALLED_APPS = ["django.contrib.admin", "snapshot_app"]
+                TEMPLATES = [{{"BACKEND": "x.Backend", "DIRS": [BASE_DIR + "/templates"], "APP_DIRS": True}}]
+            """))
+        sys.path.insert(0, project_dir)
+        self.addCleanup(sys.path.remove, project_dir)
+        self.addCleanup(sys.modules.pop, "snapshot_settings", None)
+
+        snapshot = load_cached_project_snapshot("snapshot_settings")
+        self.assertEqual([a.name for a in snapshot.app_configs], ["snapshot_app"])
+        with patch("django_unused.unused.projects.load_project_snapshot") as load:
+            self.assertEqual(load_cached_project_snapshot("snapshot_settings"), snapshot)
+            load.assert_not_called()
+
+    def test_cached_project_snapshot_sees_imported_settings(self):
+        project_dir = os.path.join(self.tmp_dir.name, "project")
+        for app_name in ["base_app", "extra_app"]:
+            os.makedirs(os.path.join(project_dir, app_name))
+            open(os.path.join(project_dir, app_name, "__init__.py"), "w").close()
+        base_settings_path = os.path.join(project_dir, "snapshot_base_settings.py")
+        with open(base_settings_path, "w") as f:
+            f.write(f"BASE_DIR = {project_dir!r}\nINSTALLED_APPS = ['base_app']\n")
+        with open(os.path.join(project_dir, "snapshot_site_settings.py"), "w") as f:
+            f.write("from snapshot_base_settings import *\n")
+        sys.path.insert(0, project_dir)
+        self.addCleanup(sys.path.remove, project_dir)
+        for module_name in ["snapshot_base_settings", "snapshot_site_settings"]:
+            self.addCleanup(sys.modules.pop, module_name, None)
+
+        snapshot = load_cached_project_snapshot("snapshot_site_settings")
+        self.assertEqual([a.name for a in snapshot.app_configs], ["base_app"])
+
+        # Only the imported module changes, and a new run imports the settings again.
+        with open(base_settings_path, "w") as f:
+            f.write(f"BASE_DIR = {project_dir!r}\nINSTALLED_APPS = ['base_app', 'extra_app']\n")
+        sys.modules.pop("snapshot_base_settings")
+        sys.modules.pop("snapshot_site_settings")
+        snapshot = load_cached_project_snapshot("snapshot_site_settings")
+        self.assertEqual([a.name for a in snapshot.app_configs], ["base_app", "extra_app"])
+
+
+class TestSnapshotTemplateSettings(unittest.TestCase):
+
+    def test_keeps_template_locations_only(self):
+        template_settings = [
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": ["/project/templates"],
+                "OPTIONS": {
+                    "context_processors": ["a.b"],
+                    "loaders": [("django.template.loaders.cached.Loader", ["x.Loader"])],
+                },
+            }
+        ]
+        self.assertEqual(
+            snapshot_template_settings(template_settings),
+            [
+                {
+                    "BACKEND": "django.template.backends.django.DjangoTemplates",
+                    "DIRS": ["/project/templates"],
+                    "APP_DIRS": False,
+                    "OPTIONS": {
+                        "loaders": [["django.template.loaders.cached.Loader", ["x.Loader"]]]
+                    },
+                }
+            ],
+        )
+
+
+class TestRoutingCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        patcher = patch.dict(os.environ, {CACHE_DIR_ENV: os.path.join(self.tmp_dir.name, "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(project_cache, "get_settings_fingerprint", return_value="settings")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.urlconf_path = os.path.join(self.tmp_dir.name, "urls.py")
+        with open(self.urlconf_path, "w") as f:
+            f.write("urlpatterns = []\n")
+        self.routing = project_cache.Routing(
+            url_patterns=[UrlPatternInfo("blog:detail", "blog/<int:pk>/", "blog.views.detail", True)],
+            urlconf_files=[self.urlconf_path],
+        )
+
+    def test_urlconfs_are_only_imported_after_a_change(self):
+        with patch.object(project_cache, "build_routing", return_value=self.routing) as build:
+            self.assertEqual(project_cache.load_routing(), self.routing)
+            self.assertEqual(project_cache.load_routing(), self.routing)
+            self.assertEqual(build.call_count, 1)
+
+            with open(self.urlconf_path, "w") as f:
+                f.write("urlpatterns = [path('', index)]\n")
+            project_cache.load_routing()
+            self.assertEqual(build.call_count, 2)
+
+            project_cache.load_routing(use_cache=False)
+            self.assertEqual(build.call_count, 3)
+
+
+class TestLayoutCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        patcher = patch.dict(os.environ, {CACHE_DIR_ENV: os.path.join(self.tmp_dir.name, "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.settings = SimpleNamespace(
+            SETTINGS_MODULE="mysite.settings",
+            BASE_DIR="/p",
+            INSTALLED_APPS=["blog"],
+            TEMPLATES=[{"BACKEND": "x.Backend", "DIRS": [], "APP_DIRS": True}],
+            ROOT_URLCONF="mysite.urls",
+        )
+        self.installed_labels = ["blog"]
+        for name, value in [("settings", self.settings), ("apps", self)]:
+            patcher = patch.object(project_cache, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.layout = project_cache.ProjectLayout(
+            app_paths={"blog": "/p/blog"},
+            template_dirs=[["/p/blog/templates", "blog", "x.Backend"]],
+        )
+
+    def get_app_configs(self):
+        # Stands in for the app registry.
+        return [SimpleNamespace(label=label) for label in self.installed_labels]
+
+    def test_layout_is_built_again_when_the_resolved_settings_change(self):
+        with patch.object(project_cache, "build_project_layout", return_value=self.layout) as build:
+            self.assertEqual(project_cache.load_project_layout(), self.layout)
+            self.assertEqual(project_cache.load_project_layout(), self.layout)
+            self.assertEqual(build.call_count, 1)
+
+            # E.g. an app added in a base module the settings module imports.
+            self.settings.INSTALLED_APPS = ["blog", "extra"]
+            project_cache.load_project_layout()
+            self.assertEqual(build.call_count, 2)
+
+            project_cache.load_project_layout(use_cache=False)
+            self.assertEqual(build.call_count, 3)
+
+    def test_layout_of_removed_app_is_not_used(self):
+        with patch.object(project_cache, "build_project_layout", return_value=self.layout) as build:
+            project_cache.load_project_layout()
+            self.installed_labels = []
+            project_cache.load_project_layout()
+            self.assertEqual(build.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
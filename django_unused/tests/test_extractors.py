@@ -0,0 +1,74 @@
+import unittest
+
+from django_unused.unused.extractors import (
+    extract_django_tags,
+    extract_jinja2_tags,
+    extract_template_tags,
+)
+from django_unused.unused.find_templates import DJANGO_BACKEND, JINJA2_BACKEND
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+
+class TestExtractDjangoTags(unittest.TestCase):
+
+    def test_include_and_extends(self):
+        source = "{% extends 'base.html' %}\n{% block content %}\n{% include \"partials/form.html\" with a=1 %}\n"
+        tags = extract_django_tags(source)
+        self.assertEqual(tags.reference_types, {1: "extend", 3: "include"})
+        self.assertEqual(tags.blocks, [(2, "content")])
+
+    def test_text_is_ignored(self):
+        tags = extract_django_tags("include extends block\n{{ include }}")
+        self.assertEqual(tags.reference_types, {})
+        self.assertEqual(tags.blocks, [])
+
+
+@unittest.skipUnless(jinja2, "Jinja2 is not installed")
+class TestExtractJinja2Tags(unittest.TestCase):
+
+    def test_references(self):
+        source = (
+            "{% extends 'base.jinja' %}\n"
+            "{% import 'macros/forms.jinja' as forms %}\n"
+            "{% from 'macros/fields.jinja' import field %}\n"
+            "{%- include\n    'partials/footer.jinja' %}\n"
+            "{% macro button(label) %}{{ label }}{% endmacro %}\n"
+            "{% block title %}{% endblock %}\n"
+        )
+        tags = extract_jinja2_tags(source)
+        self.assertEqual(
+            tags.reference_types,
+            {1: "extend", 2: "import", 3: "import", 5: "include"},
+        )
+        self.assertEqual(tags.blocks, [(7, "title")])
+
+    def test_syntax_error(self):
+        self.assertEqual(extract_jinja2_tags("{{ 'unterminated }}").reference_types, {})
+
+
+class TestExtractTemplateTags(unittest.TestCase):
+
+    def test_dispatches_on_backend(self):
+        self.assertEqual(
+            extract_template_tags("{% include 'a.html' %}", DJANGO_BACKEND).reference_types,
+            {1: "include"},
+        )
+        self.assertEqual(
+            extract_template_tags("{% include 'a.html' %}", "custom.Backend").reference_types,
+            {},
+        )
+
+    @unittest.skipUnless(jinja2, "Jinja2 is not installed")
+    def test_jinja2_backend(self):
+        self.assertEqual(
+            extract_template_tags("{% import 'a.jinja' as a %}", JINJA2_BACKEND).reference_types,
+            {1: "import"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,12 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from django_unused.management.commands._templates import (
     TemplateFilterOptions,
     filter_templates,
 )
 from django_unused.unused.find_templates import TemplateInfo
+from django_unused.unused.search_templates import setup_template_search
 
 
 class TestFilterTemplates(unittest.TestCase):
@@ -63,6 +64,25 @@ class TestFilterTemplates(unittest.TestCase):
         self.assertNotIn(self.template1, filtered_templates)
         self.assertNotIn(self.template2, filtered_templates)
 
+    @patch("django_unused.unused.search_templates.load_reference_extractors")
+    @patch(
+        "django_unused.unused.search_templates.find_py_files",
+        return_value=(["app2/views.py"], []),
+    )
+    def test_setup_template_search(self, find_py_files, load_reference_extractors):
+        setup = setup_template_search(
+            self.templates, TemplateFilterOptions(excluded_apps=["app1"])
+        )
+        load_reference_extractors.assert_called_once_with()
+        self.assertEqual(setup.templates, [self.template2, self.template3])
+        # Excluded templates can still be resolved, so that they shadow others.
+        self.assertIn("dir1/template1.html", setup.index)
+        self.assertEqual(setup.basenames, {"template2.html", "template3.html"})
+        self.assertEqual(
+            list(setup.file_paths),
+            ["app2/views.py", "dir2/template2.html", "dir3/template3.html"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
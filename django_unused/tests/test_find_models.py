@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from django_unused.unused.find_models import (
+    build_symbol_table,
+    extract_python_symbols,
+    search_unused_model_symbols,
+)
+
+
+def make_field(name, attname=None):
+    model_field = MagicMock()
+    model_field.name = name
+    model_field.attname = attname or name
+    model_field.auto_created = False
+    return model_field
+
+
+def make_model(name, field_names, foreign_keys=()):
+    model = MagicMock()
+    model.__name__ = name
+    model._meta.app_label = "blog"
+    model._meta.model_name = name.lower()
+    model._meta.local_fields = [make_field(f) for f in field_names] + [
+        make_field(f, f"{f}_id") for f in foreign_keys
+    ]
+    model._meta.local_many_to_many = []
+    return model
+
+
+class TestExtractPythonSymbols(unittest.TestCase):
+
+    def test_definitions_and_comments_are_skipped(self):
+        source = (
+            "class Article(models.Model):\n"
+            "    title = models.CharField()\n"
+            "    # subtitle is gone\n"
+            "    def summary(self):\n"
+            "        return self.body\n"
+            "Article.objects.filter(author__name__icontains='x').values('slug')\n"
+            "call_command('import_articles')\n"
+        )
+        names, strings = extract_python_symbols(source)
+        self.assertIn("body", names)
+        self.assertIn("author", names)
+        self.assertIn("name", names)
+        self.assertIn("slug", names)
+        self.assertIn("Article", names)
+        self.assertNotIn("title", names)
+        self.assertNotIn("subtitle", names)
+        self.assertNotIn("summary", names)
+        self.assertIn("import_articles", strings)
+
+    def test_dunder_names_are_not_lookups(self):
+        source = (
+            "label = type(self).__name__ + self.__class__.__doc__\n"
+            "if __name__ == '__main__':\n"
+            "    Author.objects.values('__str__', 'book__title')\n"
+        )
+        names, _ = extract_python_symbols(source)
+        self.assertNotIn("name", names)
+        self.assertNotIn("class", names)
+        self.assertNotIn("doc", names)
+        self.assertNotIn("main", names)
+        self.assertNotIn("str", names)
+        self.assertIn("book", names)
+        self.assertIn("title", names)
+
+
+class TestSearchUnusedModelSymbols(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.table = build_symbol_table(
+            [
+                make_model("Article", ["title", "subtitle"], foreign_keys=["author"]),
+                make_model("Draft", ["text"]),
+            ],
+            [("import_articles", "/blog/management/commands/import_articles.py"),
+             ("cleanup", "/blog/management/commands/cleanup.py")],
+        )
+
+    def write(self, *path_parts, source):
+        file_path = os.path.join(self.dir.name, *path_parts)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as f:
+            f.write(source)
+        return file_path
+
+    def test_unused_symbols(self):
+        file_paths = [
+            self.write("views.py", source="Article.objects.filter(author_id=1)\ncall_command('cleanup')\n"),
+            self.write("article.html", source="{{ article.title }}"),
+            self.write("migrations", "0001_initial.py", source="fields = ['subtitle', 'Draft']"),
+        ]
+        for max_in_flight in (1, 4):
+            with self.subTest(max_in_flight=max_in_flight):
+                result = search_unused_model_symbols(
+                    self.table, file_paths, {file_paths[1]}, max_in_flight
+                )
+                self.assertEqual([s.label for s in result.unused_models], ["blog.Draft"])
+                # The fields of the unused model are not reported again.
+                self.assertEqual(
+                    [s.label for s in result.unused_fields], ["blog.Article.subtitle"]
+                )
+                self.assertEqual([s.label for s in result.unused_commands], ["import_articles"])
+
+    def test_field_used_only_through_dunder_names(self):
+        table = build_symbol_table([make_model("Author", ["name"])], [])
+        views = self.write(
+            "views.py",
+            source="print(Author, type(self).__name__)\nif __name__ == '__main__':\n    pass\n",
+        )
+        result = search_unused_model_symbols(table, [views], set())
+        self.assertEqual([s.label for s in result.unused_fields], ["blog.Author.name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from django_unused.unused.find_templates import DJANGO_BACKEND
+from django_unused.unused.find_translations import (
+    extract_django_template_translations,
+    extract_jinja2_translations,
+    extract_python_translations,
+    parse_po_source,
+    search_unused_translations,
+)
+
+PO_SOURCE = '''# Translations for the blog.
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+#: blog/views.py:10
+msgid "Hello"
+msgstr "Bonjour"
+
+msgctxt "month name"
+msgid "May"
+msgstr "Mai"
+
+msgid ""
+"A long "
+"message"
+msgid_plural "Long messages"
+msgstr[0] "Un long message"
+msgstr[1] "Des longs messages"
+
+#~ msgid "Obsolete"
+#~ msgstr "Obsolète"
+'''
+
+
+class TestParsePoSource(unittest.TestCase):
+
+    def test_entries(self):
+        entries = parse_po_source(PO_SOURCE, "fr/LC_MESSAGES/django.po")
+        self.assertEqual(
+            [(e.key, e.line_number) for e in entries],
+            [((None, "Hello"), 7), (("month name", "May"), 11), ((None, "A long message"), 14)],
+        )
+
+
+class TestExtractPythonTranslations(unittest.TestCase):
+
+    def test_gettext_functions(self):
+        source = (
+            "from django.utils.translation import gettext_lazy as _, pgettext\n"
+            "title = _('Hello')\n"
+            "month = pgettext('month name', 'May')\n"
+            "message = ngettext(\n"
+            "    'A long ' 'message',  # implicit concatenation\n"
+            "    'Long messages', count)\n"
+            "dynamic = _(name)\n"
+            "# _('Commented out')\n"
+        )
+        self.assertEqual(
+            extract_python_translations(source),
+            {(None, "Hello"), ("month name", "May"), (None, "A long message")},
+        )
+
+
+class TestExtractTemplateTranslations(unittest.TestCase):
+
+    def test_django_template(self):
+        source = (
+            "{% load i18n %}{% trans 'Hello' %}\n"
+            "{% translate 'May' context 'month name' %}\n"
+            "{% blocktrans count counter=n %}{{ counter }} item{% plural %}{{ counter }} items{% endblocktrans %}"
+        )
+        self.assertEqual(
+            extract_django_template_translations(source),
+            {(None, "Hello"), ("month name", "May"), (None, "%(counter)s item")},
+        )
+
+    def test_jinja2_template(self):
+        source = "{{ _('Hello') }}\n{% trans %}Welcome{% endtrans %}\n{{ pgettext('month name', 'May') }}"
+        self.assertEqual(
+            extract_jinja2_translations(source),
+            {(None, "Hello"), (None, "Welcome"), ("month name", "May")},
+        )
+
+
+class TestSearchUnusedTranslations(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def write(self, name, source):
+        file_path = os.path.join(self.dir.name, name)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(source)
+        return file_path
+
+    def test_files_are_read_ahead(self):
+        po_file = self.write("django.po", PO_SOURCE)
+        views = self.write("views.py", "_('Hello')\n")
+        template = self.write("page.html", "{% load i18n %}{% trans 'May' context 'month name' %}")
+        result = search_unused_translations(
+            [po_file], [views, template], {template: DJANGO_BACKEND}, max_in_flight=4
+        )
+        self.assertEqual([e.msgid for e in result.unused_entries], ["A long message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
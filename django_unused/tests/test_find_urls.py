@@ -0,0 +1,147 @@
+import functools
+import os
+import tempfile
+import textwrap
+import types
+import unittest
+
+from django.urls import include, path
+from django.views.generic import View
+
+from django_unused.unused.find_templates import DJANGO_BACKEND, JINJA2_BACKEND
+from django_unused.unused.find_urls import (
+    extract_url_names,
+    find_used_url_names,
+    walk_url_patterns,
+)
+from django_unused.unused.find_views import is_unrouted_function_view, is_unused_view
+
+
+def article_detail(request, pk):
+    pass
+
+
+def article_list(request):
+    pass
+
+
+def login_required(view):
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class ArchiveView(View):
+    pass
+
+
+class FeedView(View):
+    pass
+
+
+class TestWalkUrlPatterns(unittest.TestCase):
+
+    def setUp(self):
+        blog_patterns = (
+            [
+                path("<int:pk>/", login_required(article_detail), name="detail"),
+                path("archive/", ArchiveView.as_view()),
+            ],
+            "blog",
+        )
+        feed_urls = types.ModuleType("feed.urls")
+        feed_urls.__file__ = "/p/feed/urls.py"
+        feed_urls.urlpatterns = []
+        self.urlconf_files = []
+        self.url_patterns = walk_url_patterns(
+            [
+                path("", article_list, name="home"),
+                path("blog/", include(blog_patterns)),
+                path("feed/", include(feed_urls)),
+            ],
+            urlconf_files=self.urlconf_files,
+        )
+
+    def test_urlconf_files(self):
+        self.assertEqual(self.urlconf_files, ["/p/feed/urls.py"])
+
+    def test_names_are_namespaced(self):
+        self.assertEqual(
+            [(p.name, p.pattern) for p in self.url_patterns],
+            [("home", ""), ("blog:detail", "blog/<int:pk>/"), (None, "blog/archive/")],
+        )
+
+    def test_views_are_unwrapped(self):
+        self.assertEqual(
+            [p.view for p in self.url_patterns], [article_list, article_detail, ArchiveView]
+        )
+
+    def test_unrouted_function_views(self):
+        routed_view_paths = {p.view_path for p in self.url_patterns}
+
+        def article_feed(request):
+            pass
+
+        self.assertFalse(is_unrouted_function_view(article_detail, routed_view_paths))
+        self.assertTrue(is_unrouted_function_view(article_feed, routed_view_paths))
+
+    def test_unused_class_based_views(self):
+        # as_view() callbacks are all named "view", so the class itself must be matched.
+        routed_view_paths = {p.view_path for p in self.url_patterns}
+        self.assertFalse(is_unused_view(ArchiveView, routed_view_paths))
+        self.assertTrue(is_unused_view(FeedView, routed_view_paths))
+
+
+class TestFindUsedUrlNames(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name: str, source: str) -> str:
+        file_path = os.path.join(self.tmp_dir.name, name)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(source)
+        return file_path
+
+    def test_reversed_names(self):
+        url_names = {"home", "blog:detail", "blog:archive"}
+        file_paths = [
+            self.write("views.py", 'return redirect("home")\ndetail = "blog:archive"'),
+            self.write("detail.html", '<a href="{% url \'blog:detail\' pk=1 %}">'),
+        ]
+        backends = {file_paths[1]: DJANGO_BACKEND}
+        self.assertEqual(
+            find_used_url_names(url_names, file_paths, backends), {"home", "blog:detail"}
+        )
+
+    def test_wrapped_call(self):
+        source = textwrap.dedent("""
+            def form_valid(self, form):
+                return redirect(
+                    "blog:detail", pk=self.object.pk  # back to the article
+                )
+
+            success_url = reverse_lazy(
+                "blog:list"
+            )
+        """)
+        self.assertEqual(extract_url_names(source), {"blog:detail", "blog:list"})
+
+    def test_url_pattern_definitions_are_not_uses(self):
+        source = textwrap.dedent("""
+            urlpatterns = [
+                url(r"^$", views.index, name="home"),
+                path("old/", RedirectView.as_view(pattern_name="blog:list")),
+            ]
+        """)
+        self.assertEqual(extract_url_names(source), {"blog:list"})
+
+    def test_jinja2_call(self):
+        source = '<a href="{{ url(\n    "blog:detail", pk=1) }}">'
+        self.assertEqual(extract_url_names(source, JINJA2_BACKEND), {"blog:detail"})
+
+if __name__ == "__main__":
+    unittest.main()
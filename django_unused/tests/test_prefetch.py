@@ -0,0 +1,60 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from django_unused.unused import prefetch
+from django_unused.unused.prefetch import prefetch_files
+
+
+class TestPrefetchFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.reading = 0
+        self.max_reading = 0
+
+        def slow_read(file_path):
+            with self.lock:
+                self.reading += 1
+                self.max_reading = max(self.max_reading, self.reading)
+            # Later files finish first, which must not change the order they are yielded in.
+            time.sleep(0.02 / int(file_path))
+            with self.lock:
+                self.reading -= 1
+            return f"contents of {file_path}"
+
+        patcher = patch.object(prefetch, "read_file", side_effect=slow_read)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_order_and_reads_in_flight(self):
+        file_paths = [str(i) for i in range(1, 21)]
+        self.assertEqual(
+            list(prefetch_files(file_paths, max_in_flight=4)),
+            [(p, f"contents of {p}") for p in file_paths],
+        )
+        self.assertGreater(self.max_reading, 1)
+        self.assertLessEqual(self.max_reading, 4)
+
+    def test_paths_are_pulled_lazily(self):
+        pulled = []
+
+        def discover():
+            for i in range(1, 11):
+                pulled.append(i)
+                yield str(i)
+
+        files = prefetch_files(discover(), max_in_flight=3)
+        self.assertEqual(next(files), ("1", "contents of 1"))
+        # Only the reads in flight have been started; the walk is not finished first.
+        self.assertEqual(pulled, [1, 2, 3])
+        files.close()
+
+    def test_sequential(self):
+        self.assertEqual(list(prefetch_files(["1", "2"])), [("1", "contents of 1"), ("2", "contents of 2")])
+        self.assertEqual(self.max_reading, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
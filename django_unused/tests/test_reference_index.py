@@ -0,0 +1,148 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_unused.management.commands._templates import search_unused_templates_since
+from django_unused.unused.find_templates import TemplateInfo
+from django_unused.unused.git_diff import get_changed_files, read_file_at_rev, resolve_rev
+from django_unused.unused.reference_index import (
+    load_reference_index,
+    save_reference_index,
+)
+from django_unused.unused.scan import RawReference
+from django_unused.unused.search_templates import setup_template_search
+
+
+class TestReferenceIndex(unittest.TestCase):
+
+    def test_round_trip(self):
+        file_references = {
+            "/p/app1/views.py": [
+                RawReference(3, "template_name = 'app1/page.html'", "app1/page.html", "unknown")
+            ],
+            "/p/templates/base.html": [],
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "baseline.json")
+            save_reference_index(path, file_references, rev="abc123")
+            index = load_reference_index(path)
+        self.assertEqual(index.files, file_references)
+        self.assertEqual(index.rev, "abc123")
+
+    def test_missing_index(self):
+        self.assertIsNone(load_reference_index("/nonexistent/baseline.json"))
+
+
+class GitRepoTestCase(unittest.TestCase):
+
+    def git(self, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=self.tmp_dir.name,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.realpath(self.tmp_dir.name)
+        for name in ("views.py", "unchanged.py"):
+            with open(os.path.join(self.root, name), "w") as f:
+                f.write("template_name = 'a.html'\n")
+        self.git("init", "-q")
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "initial")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+
+class TestGetChangedFiles(GitRepoTestCase):
+
+    def test_modified_and_untracked_files(self):
+        with open(os.path.join(self.root, "views.py"), "w") as f:
+            f.write("template_name = 'b.html'\n")
+        with open(os.path.join(self.root, "new.py"), "w") as f:
+            f.write("")
+        self.assertEqual(
+            sorted(get_changed_files("HEAD", cwd=self.root)),
+            [os.path.join(self.root, "new.py"), os.path.join(self.root, "views.py")],
+        )
+
+    def test_read_file_at_rev(self):
+        with open(os.path.join(self.root, "views.py"), "w") as f:
+            f.write("template_name = 'b.html'\n")
+        self.assertEqual(
+            read_file_at_rev("HEAD", os.path.join(self.root, "views.py"), cwd=self.root),
+            "template_name = 'a.html'\n",
+        )
+        self.assertIsNone(read_file_at_rev("HEAD", os.path.join(self.root, "new.py"), cwd=self.root))
+
+
+class TestSearchUnusedTemplatesSince(GitRepoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+        self.detail = self.write_template("detail.html", '{% include "parts/row.html" %}\n')
+        self.row = self.write_template("parts/row.html", "row\n")
+        self.templates = [self.detail, self.row]
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", "templates")
+
+        self.views = os.path.join(self.root, "views.py")
+        self.baseline_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.baseline_dir.cleanup)
+        self.baseline_path = os.path.join(self.baseline_dir.name, "baseline.json")
+        save_reference_index(
+            self.baseline_path,
+            {
+                self.views: [],
+                self.detail.file_path: [
+                    RawReference(1, '{% include "parts/row.html" %}', "parts/row.html", "include")
+                ],
+                self.row.file_path: [],
+            },
+            rev=resolve_rev("HEAD", cwd=self.root),
+        )
+
+    def write_template(self, template_path: str, content: str) -> TemplateInfo:
+        file_path = os.path.join(self.root, "templates", *template_path.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as f:
+            f.write(content)
+        return TemplateInfo(file_path, template_path, None)
+
+    def search_since(self, rev: str):
+        with patch(
+            "django_unused.unused.search_templates.find_py_files",
+            return_value=([self.views], []),
+        ):
+            setup = setup_template_search(self.templates)
+        return search_unused_templates_since(setup, rev, self.baseline_path)
+
+    def test_commits_after_the_baseline_are_rescanned(self):
+        self.write_template("detail.html", "no include\n")
+        self.git("commit", "-q", "-a", "-m", "drop include")
+
+        changes = self.search_since("HEAD")
+        self.assertEqual(changes.newly_unused_templates, [])
+        self.assertIn(self.row, changes.result.unused_templates)
+
+        changes = self.search_since("HEAD~1")
+        self.assertEqual(changes.newly_unused_templates, [self.row])
+        self.assertEqual(len(changes.removed_references), 1)
+
+    def test_baseline_is_refreshed(self):
+        self.write_template("detail.html", "no include\n")
+        self.search_since("HEAD")
+        self.assertEqual(load_reference_index(self.baseline_path).files[self.detail.file_path], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import errno
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django_unused.unused.find_templates import TemplateInfo, build_template_index
+from django_unused.unused.reference_index import ReferenceIndex
+from django_unused.unused.remove_templates import (
+    get_template_root,
+    plan_template_removal,
+    remove_templates,
+    restore_templates,
+)
+from django_unused.unused.scan import RawReference
+
+
+class TestRemoveTemplates(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = os.path.join(self.tmp_dir.name, "templates")
+        self.templates = [
+            self.make_template("base.html"),
+            self.make_template("app1/page.html"),
+            self.make_template("app1/old/list.html"),
+            self.make_template("app1/old/detail.html"),
+        ]
+        self.trash_dir = os.path.join(self.tmp_dir.name, "trash")
+
+    def make_template(self, template_path: str) -> TemplateInfo:
+        file_path = os.path.join(self.root, *template_path.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(template_path)
+        return TemplateInfo(file_path, template_path, None)
+
+    def test_get_template_root(self):
+        self.assertEqual(get_template_root(self.templates[2]), self.root)
+
+    def test_plan_rechecks_candidates(self):
+        baseline = ReferenceIndex(
+            files={
+                "/p/views.py": [
+                    RawReference(1, "template_name = 'app1/page.html'", "app1/page.html", "unknown")
+                ]
+            }
+        )
+        base, page, old_list, _ = self.templates
+        plan = plan_template_removal(
+            [page.file_path, old_list.file_path, "/p/templates/gone.html"],
+            self.templates,
+            build_template_index(self.templates),
+            baseline,
+        )
+        self.assertEqual(plan.templates, [old_list])
+        self.assertEqual(plan.still_used, [page])
+        self.assertEqual(plan.missing, ["/p/templates/gone.html"])
+
+    def test_remove_and_restore(self):
+        removed = self.templates[2:]
+        manifest = remove_templates(removed, self.trash_dir)
+        for template in removed:
+            self.assertFalse(os.path.exists(template.file_path))
+        # The emptied subdirectory goes, its non-empty parent and the template root stay.
+        self.assertEqual(manifest.directories, [os.path.join(self.root, "app1", "old")])
+        self.assertTrue(os.path.isdir(os.path.join(self.root, "app1")))
+
+        restore_templates(manifest.path)
+        for template in removed:
+            with open(template.file_path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), template.template_path)
+
+    def test_failed_move_is_rolled_back(self):
+        replace = os.replace
+        calls = []
+
+        def failing_replace(source, target):
+            calls.append(source)
+            if len(calls) == 2:
+                raise PermissionError(errno.EACCES, "Permission denied")
+            replace(source, target)
+
+        with patch("django_unused.unused.remove_templates.os.replace", failing_replace):
+            with self.assertRaises(OSError):
+                remove_templates(self.templates[1:3], self.trash_dir)
+        for template in self.templates:
+            self.assertTrue(os.path.exists(template.file_path))
+        self.assertEqual(os.listdir(self.trash_dir), [])
+
+    def test_cross_device_move_copies(self):
+        replace = os.replace
+
+        # Renames out of a directory fail as if the trash were on another filesystem.
+        def cross_device_replace(source, target):
+            if os.path.dirname(source) != os.path.dirname(target):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            replace(source, target)
+
+        removed = self.templates[2:]
+        with patch("os.replace", cross_device_replace), patch("os.rename", cross_device_replace):
+            manifest = remove_templates(removed, self.trash_dir)
+            for template in removed:
+                self.assertFalse(os.path.exists(template.file_path))
+            restore_templates(manifest.path)
+        for template in removed:
+            with open(template.file_path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), template.template_path)
+
+    def test_restore_does_not_overwrite(self):
+        manifest = remove_templates(self.templates[:1], self.trash_dir)
+        self.make_template("base.html")
+        with self.assertRaises(FileExistsError):
+            restore_templates(manifest.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from django_unused.unused.find_templates import (
+    TemplateInfo,
+    build_basename_index,
+    build_template_index,
+    resolve_template_name,
+)
+
+
+def make_template(template_path):
+    return TemplateInfo(
+        file_path=f"/project/templates/{template_path}",
+        template_path=template_path,
+        app_config=None,
+    )
+
+
+class TestResolveTemplateName(unittest.TestCase):
+
+    def setUp(self):
+        self.index = build_template_index(
+            [
+                make_template("base.html"),
+                make_template("app1/list.html"),
+                make_template("app2/list.html"),
+                make_template("app2/form.html"),
+            ]
+        )
+        self.basename_index = build_basename_index(self.index)
+
+    def resolve(self, token, referencing_path=None):
+        return resolve_template_name(
+            token, self.index, self.basename_index, referencing_path
+        )
+
+    def test_build_basename_index(self):
+        self.assertEqual(
+            self.basename_index["list.html"], ["app1/list.html", "app2/list.html"]
+        )
+        self.assertEqual(self.basename_index["form.html"], ["app2/form.html"])
+
+    def test_full_name(self):
+        self.assertEqual(self.resolve("app1/list.html"), ("app1/list.html", 1))
+
+    def test_prefixed_path(self):
+        self.assertEqual(
+            self.resolve("/project/templates/app2/form.html"), ("app2/form.html", 1)
+        )
+        self.assertIsNone(self.resolve("other/list.html"))
+
+    def test_unambiguous_basename(self):
+        self.assertEqual(self.resolve("form.html"), ("app2/form.html", 1))
+
+    def test_ambiguous_basename(self):
+        self.assertIsNone(self.resolve("list.html"))
+        self.assertIsNone(self.resolve("list.html", "base.html"))
+
+    def test_basename_next_to_referencing_template(self):
+        self.assertEqual(
+            self.resolve("list.html", "app1/detail.html"), ("app1/list.html", 2)
+        )
+
+    def test_relative_name(self):
+        self.assertEqual(
+            self.resolve("./list.html", "app2/detail.html"), ("app2/list.html", 1)
+        )
+        self.assertEqual(
+            self.resolve("../base.html", "app2/detail.html"), ("base.html", 1)
+        )
+        self.assertIsNone(self.resolve("./list.html"))
+
+    def test_unknown_name(self):
+        self.assertIsNone(self.resolve("missing.html"))
+        self.assertIsNone(self.resolve("self.template_name"))
+
+
+if __name__ == "__main__":
+    unittest.main()
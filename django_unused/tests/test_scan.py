@@ -0,0 +1,114 @@
+import unittest
+
+from django_unused.management.commands._templates import resolve_references
+from django_unused.unused.extractors import (
+    ReferenceExtractor,
+    regex_extractor,
+    register_reference_extractor,
+    unregister_reference_extractor,
+)
+from django_unused.unused.find_templates import TemplateInfo, build_template_index
+from django_unused.unused.scan import RawReference, scan_source
+
+
+class TestScanSource(unittest.TestCase):
+
+    def test_only_candidate_tokens_are_kept(self):
+        source = "{% extends 'base.html' %}\n<p>Nothing here.</p>\n{% include './form.html' %}\n"
+        self.assertEqual(
+            scan_source(
+                source,
+                {"base.html"},
+                "django.template.backends.django.DjangoTemplates",
+            ),
+            [
+                RawReference(1, "{% extends 'base.html' %}", "base.html", "extend"),
+                RawReference(3, "{% include './form.html' %}", "./form.html", "include"),
+            ],
+        )
+
+    def test_python_source(self):
+        source = "class ListView(View):\n    template_name = 'app1/list.html'\n"
+        self.assertEqual(
+            scan_source(source, {"list.html"}),
+            [
+                RawReference(
+                    2, "template_name = 'app1/list.html'", "app1/list.html", "unknown"
+                )
+            ],
+        )
+
+
+class TestReferenceExtractors(unittest.TestCase):
+
+    def setUp(self):
+        register_reference_extractor(
+            regex_extractor("render_email", r"render_email\(\s*[\"']([\w/-]+)", "emails/{}.html")
+        )
+        self.addCleanup(unregister_reference_extractor, "render_email")
+
+    def test_extracted_names_are_added(self):
+        source = "def send(user):\n    render_email('welcome', user)\n"
+        self.assertEqual(
+            scan_source(source, {"welcome.html"}),
+            [
+                RawReference(
+                    2, "render_email('welcome', user)", "emails/welcome.html", "render_email"
+                )
+            ],
+        )
+
+    def test_only_prefiltered_lines_are_extracted(self):
+        calls = []
+        register_reference_extractor(
+            ReferenceExtractor(
+                name="mail",
+                prefilter_tokens=("send_mail(",),
+                extract=lambda line: calls.append(line) or [],
+            )
+        )
+        self.addCleanup(unregister_reference_extractor, "mail")
+        scan_source("a = 1\nsend_mail('x')\nb = 2\n", set())
+        scan_source("a = 1\n", set())
+        self.assertEqual(calls, ["send_mail('x')"])
+
+    def test_file_types(self):
+        source = "{{ render_email('welcome') }}\n"
+        self.assertEqual(
+            scan_source(source, {"welcome.html"}, "django.template.backends.django.DjangoTemplates"),
+            [],
+        )
+
+
+class TestResolveReferences(unittest.TestCase):
+
+    def setUp(self):
+        self.base = TemplateInfo("/p/templates/base.html", "base.html", None)
+        self.page = TemplateInfo("/p/templates/app1/page.html", "app1/page.html", None)
+        self.unused = TemplateInfo("/p/templates/app1/unused.html", "app1/unused.html", None)
+        self.templates = [self.base, self.page, self.unused]
+
+    def test_resolve_references(self):
+        file_references = {
+            "/p/app1/views.py": [
+                RawReference(3, "template_name = 'app1/page.html'", "app1/page.html", "unknown"),
+            ],
+            "/p/templates/app1/page.html": [
+                RawReference(1, "{% extends 'base.html' %}", "base.html", "extend"),
+            ],
+        }
+        result = resolve_references(
+            self.templates, build_template_index(self.templates), file_references
+        )
+        self.assertEqual(result.unused_templates, [self.unused])
+        self.assertEqual(
+            [u.template_info for u in result.used_templates], [self.page, self.base]
+        )
+        reference = result.used_templates[1].references[0]
+        self.assertIs(reference.template_info, self.page)
+        self.assertEqual(reference.reference_type, "extend")
+        self.assertEqual(result.used_templates[0].references[0].source_path, "/p/app1/views.py")
+
+
+if __name__ == "__main__":
+    unittest.main()
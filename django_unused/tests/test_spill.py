@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from django_unused.unused import spill
+from django_unused.unused.find_templates import TemplateInfo, build_template_index
+from django_unused.unused.scan import RawReference
+from django_unused.unused.search_templates import ReferenceResolver
+from django_unused.unused.spill import ReferenceSpill, SpillingReferenceResolver
+
+
+class TestReferenceSpill(unittest.TestCase):
+
+    def test_groups_keep_insertion_order_across_runs(self):
+        # A budget of one byte writes every record to its own run, and the runs get merged.
+        with mock.patch.object(spill, "MAX_MERGE_WIDTH", 3):
+            reference_spill = ReferenceSpill(memory_budget=1)
+            for i in range(10):
+                reference_spill.add("b" if i % 2 else "a", [i])
+            self.assertLessEqual(len(reference_spill.run_paths), 3)
+            self.assertEqual(
+                list(reference_spill.iter_groups()),
+                [("a", [[0], [2], [4], [6], [8]]), ("b", [[1], [3], [5], [7], [9]])],
+            )
+
+    def test_budget_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            ReferenceSpill(memory_budget=0)
+
+    def test_buffer_counts_whole_records(self):
+        reference_spill = ReferenceSpill(memory_budget=10 ** 6)
+        reference_spill.add("a", [1])
+        line = reference_spill.buffer[0][1]
+        self.assertGreater(reference_spill.buffer_size, sys.getsizeof("a") + sys.getsizeof(line))
+
+
+class TestSpillingReferenceResolver(unittest.TestCase):
+
+    def setUp(self):
+        self.base = TemplateInfo("/p/templates/base.html", "base.html", None)
+        self.page = TemplateInfo("/p/templates/app1/page.html", "app1/page.html", None)
+        self.unused = TemplateInfo("/p/templates/app1/unused.html", "app1/unused.html", None)
+        self.templates = [self.base, self.page, self.unused]
+        self.index = build_template_index(self.templates)
+        self.file_references = {
+            "/p/app1/views.py": [
+                RawReference(3, "template_name = 'app1/page.html'", "app1/page.html", "unknown"),
+                RawReference(9, "render(request, 'base.html')", "base.html", "unknown"),
+            ],
+            "/p/templates/app1/page.html": [
+                RawReference(1, "{% extends 'base.html' %}", "base.html", "extend"),
+            ],
+        }
+
+    def resolve(self, resolver):
+        for file_path, raw_references in self.file_references.items():
+            resolver.add_file(file_path, raw_references)
+        return resolver.result()
+
+    def test_same_answer_as_in_memory(self):
+        expected = self.resolve(ReferenceResolver(self.templates, self.index))
+        with tempfile.TemporaryDirectory() as spill_dir:
+            result = self.resolve(
+                SpillingReferenceResolver(self.templates, self.index, 1, spill_dir)
+            )
+            self.assertTrue(os.listdir(spill_dir))
+            self.assertEqual(result.unused_templates, expected.unused_templates)
+            self.assertEqual(len(result.used_templates), 2)
+            # Used templates come back in search order, each with all its references.
+            used_templates = list(result.used_templates)
+            self.assertEqual(
+                [u.template_info for u in used_templates], [self.base, self.page]
+            )
+            self.assertEqual(
+                [(r.file_path, r.line_number, r.template_info) for r in used_templates[0].references],
+                [("/p/app1/views.py", 9, None), ("/p/templates/app1/page.html", 1, self.page)],
+            )
+
+    def test_blocks_are_spilled(self):
+        self.file_references["/p/templates/base.html"] = [
+            RawReference(2, "{% block content %}", "content", "block"),
+            RawReference(4, "{% block footer %}", "footer", "block"),
+        ]
+        with tempfile.TemporaryDirectory() as spill_dir:
+            resolver = SpillingReferenceResolver(self.templates, self.index, 1, spill_dir)
+            result = self.resolve(resolver)
+            self.assertEqual(resolver.blocks, {})
+            self.assertEqual(result.blocks.get(self.base.file_path, []), ["content", "footer"])
+            self.assertEqual(result.blocks.get(self.page.file_path, []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
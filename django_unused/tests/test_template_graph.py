@@ -0,0 +1,77 @@
+import unittest
+
+from django_unused.unused.find_templates import TemplateInfo, build_template_index
+from django_unused.unused.scan import BLOCK_REFERENCE_TYPE, RawReference
+from django_unused.unused.search_templates import resolve_references
+from django_unused.unused.template_graph import analyse_template_graph, topological_order
+
+
+def make_template(template_path):
+    return TemplateInfo(f"/p/templates/{template_path}", template_path, None)
+
+
+def block(line_number, name):
+    return RawReference(line_number, f"{{% block {name} %}}", name, BLOCK_REFERENCE_TYPE)
+
+
+def reference(line_number, token, reference_type="unknown"):
+    return RawReference(line_number, token, token, reference_type)
+
+
+class TestAnalyseTemplateGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.base = make_template("base.html")
+        self.section = make_template("section.html")
+        self.page = make_template("page.html")
+        self.old_page = make_template("old_page.html")
+        self.old_partial = make_template("partials/old.html")
+        self.templates = [
+            self.base, self.section, self.page, self.old_page, self.old_partial
+        ]
+        file_references = {
+            "/p/views.py": [reference(1, "page.html")],
+            self.base.file_path: [block(1, "title"), block(2, "content"), block(3, "sidebar")],
+            self.section.file_path: [
+                reference(1, "base.html", "extend"),
+                block(2, "content"),
+            ],
+            self.page.file_path: [
+                reference(1, "section.html", "extend"),
+                block(2, "title"),
+            ],
+            self.old_page.file_path: [
+                reference(1, "base.html", "extend"),
+                reference(2, "partials/old.html", "include"),
+            ],
+        }
+        self.result = resolve_references(
+            self.templates, build_template_index(self.templates), file_references
+        )
+
+    def test_dead_templates(self):
+        graph = analyse_template_graph(self.result)
+        self.assertEqual(self.result.unused_templates, [self.old_page])
+        self.assertEqual(graph.dead_templates, [self.old_partial])
+
+    def test_block_overrides(self):
+        graph = analyse_template_graph(self.result)
+        overrides = {b.template_info.template_path: b for b in graph.block_overrides}
+        self.assertEqual(sorted(overrides), ["base.html", "section.html"])
+        self.assertEqual(
+            overrides["base.html"].overrides,
+            {"title": [self.page], "content": [self.section], "sidebar": []},
+        )
+        self.assertEqual(overrides["base.html"].unused_blocks, ["sidebar"])
+        self.assertEqual(overrides["section.html"].unused_blocks, ["content"])
+
+
+class TestTopologicalOrder(unittest.TestCase):
+
+    def test_parents_first_and_cycles_left_out(self):
+        children = {"a": {"b", "c"}, "b": {"d"}, "x": {"y"}, "y": {"x"}}
+        self.assertEqual(topological_order(children), ["a", "b", "c", "d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import unittest
+from unittest.mock import MagicMock
+
+from django_unused.unused.find_templates import (
+    APP_DIRECTORIES_LOADER,
+    CACHED_LOADER,
+    FILESYSTEM_LOADER,
+    DJANGO_BACKEND,
+    JINJA2_BACKEND,
+    TemplateInfo,
+    build_template_index,
+    find_shadowed_templates,
+    get_backend_template_dirs,
+    get_template_loaders,
+)
+
+
+class TestGetTemplateLoaders(unittest.TestCase):
+
+    def test_default_loaders(self):
+        self.assertEqual(
+            get_template_loaders({"DIRS": [], "APP_DIRS": True}),
+            [(FILESYSTEM_LOADER, None), (APP_DIRECTORIES_LOADER, None)],
+        )
+        self.assertEqual(
+            get_template_loaders({"DIRS": []}), [(FILESYSTEM_LOADER, None)]
+        )
+
+    def test_cached_loader_is_unwrapped(self):
+        backend = {
+            "OPTIONS": {
+                "loaders": [
+                    (CACHED_LOADER, [APP_DIRECTORIES_LOADER, FILESYSTEM_LOADER]),
+                ]
+            }
+        }
+        self.assertEqual(
+            get_template_loaders(backend),
+            [(APP_DIRECTORIES_LOADER, None), (FILESYSTEM_LOADER, None)],
+        )
+
+    def test_filesystem_loader_with_dirs(self):
+        backend = {"OPTIONS": {"loaders": [(FILESYSTEM_LOADER, ["/custom"])]}}
+        self.assertEqual(get_template_loaders(backend), [(FILESYSTEM_LOADER, ["/custom"])])
+
+
+class TestGetBackendTemplateDirs(unittest.TestCase):
+
+    def setUp(self):
+        self.app_config = MagicMock()
+        self.app_config.path = "/project/app1"
+
+    def test_django_backend(self):
+        backend = {"BACKEND": DJANGO_BACKEND, "DIRS": ["/project/templates"], "APP_DIRS": True}
+        self.assertEqual(
+            get_backend_template_dirs(backend, [self.app_config]),
+            [
+                ("/project/templates", None),
+                (os.path.join("/project/app1", "templates"), self.app_config),
+            ],
+        )
+
+    def test_django_backend_with_app_directories_first(self):
+        backend = {
+            "BACKEND": DJANGO_BACKEND,
+            "DIRS": ["/project/templates"],
+            "OPTIONS": {"loaders": [APP_DIRECTORIES_LOADER, FILESYSTEM_LOADER]},
+        }
+        self.assertEqual(
+            get_backend_template_dirs(backend, [self.app_config]),
+            [
+                (os.path.join("/project/app1", "templates"), self.app_config),
+                ("/project/templates", None),
+            ],
+        )
+
+    def test_jinja2_backend(self):
+        backend = {"BACKEND": JINJA2_BACKEND, "DIRS": ["/project/jinja2"], "APP_DIRS": True}
+        self.assertEqual(
+            get_backend_template_dirs(backend, [self.app_config]),
+            [
+                ("/project/jinja2", None),
+                (os.path.join("/project/app1", "jinja2"), self.app_config),
+            ],
+        )
+
+
+class TestBuildTemplateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.global_base = TemplateInfo(
+            file_path="/project/templates/base.html",
+            template_path="base.html",
+            app_config=None,
+        )
+        self.app_base = TemplateInfo(
+            file_path="/project/app1/templates/base.html",
+            template_path="base.html",
+            app_config=None,
+        )
+        self.app_list = TemplateInfo(
+            file_path="/project/app1/templates/app1/list.html",
+            template_path="app1/list.html",
+            app_config=None,
+        )
+        self.templates = [self.global_base, self.app_base, self.app_list]
+
+    def test_first_template_wins(self):
+        index = build_template_index(self.templates)
+        self.assertEqual(len(index), 2)
+        self.assertIs(index["base.html"], self.global_base)
+        self.assertIs(index["app1/list.html"], self.app_list)
+
+    def test_find_shadowed_templates(self):
+        index = build_template_index(self.templates)
+        self.assertEqual(
+            find_shadowed_templates(self.templates, index), [self.app_base]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from argparse import ArgumentTypeError
+
+from django.core.management.base import CommandError
+
+from django_unused.management.commands.unused import Command, positive_int
+
+
+class TestMultiProjectOptions(unittest.TestCase):
+
+    def setUp(self):
+        self.command = Command()
+        self.options = {
+            "settings_modules": ["site_a.settings", "site_b.settings"],
+            "since": None,
+            "save_baseline": False,
+            "graph": False,
+            "memory_budget": None,
+            "io_threads": 4,
+        }
+
+    def test_templates_with_io_threads(self):
+        self.command.check_multi_project_options("templates", self.options)
+
+    def test_single_project_options_are_rejected(self):
+        self.options.update(since="HEAD", graph=True)
+        with self.assertRaisesRegex(CommandError, "--since, --graph"):
+            self.command.check_multi_project_options("templates", self.options)
+
+    def test_views_are_rejected(self):
+        with self.assertRaisesRegex(CommandError, "only searches for unused templates"):
+            self.command.check_multi_project_options("views", self.options)
+
+
+class TestSinceOptions(unittest.TestCase):
+
+    def test_options_ignored_by_since_are_rejected(self):
+        options = {
+            "unused_type": "templates",
+            "since": "HEAD",
+            "graph": True,
+            "memory_budget": 5,
+            "write_snapshot": "/tmp/s.json",
+        }
+        with self.assertRaisesRegex(
+            CommandError, "--since cannot be combined with --graph, --memory-budget, --write-snapshot"
+        ):
+            Command().handle_templates(options)
+
+
+class TestDryRun(unittest.TestCase):
+
+    def test_dry_run_needs_delete(self):
+        options = {"unused_type": "templates", "dry_run": True, "delete": None}
+        with self.assertRaisesRegex(CommandError, "--dry-run only applies to --delete"):
+            Command().handle(**options)
+
+
+class TestPositiveInt(unittest.TestCase):
+
+    def test_positive_int(self):
+        self.assertEqual(positive_int("64"), 64)
+        for value in ["0", "-1", "many"]:
+            with self.subTest(value=value), self.assertRaises(ArgumentTypeError):
+                positive_int(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
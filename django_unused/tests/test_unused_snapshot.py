@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+
+from django_unused.unused.unused_snapshot import (
+    build_unused_snapshot,
+    compare_unused_snapshots,
+    get_template_id,
+    load_unused_snapshot,
+    merge_sorted_diff,
+    save_unused_snapshot,
+)
+
+
+class TestMergeSortedDiff(unittest.TestCase):
+
+    def test_added_and_removed(self):
+        self.assertEqual(
+            merge_sorted_diff(["a", "c", "d", "f"], ["b", "c", "f", "g"]),
+            (["b", "g"], ["a", "d"]),
+        )
+        self.assertEqual(merge_sorted_diff([], ["a"]), (["a"], []))
+        self.assertEqual(merge_sorted_diff(["a"], []), ([], ["a"]))
+
+
+class TestUnusedSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = os.path.join(self.tmp_dir.name, "unused.json")
+
+    def test_items_are_sorted_and_unique(self):
+        snapshot = build_unused_snapshot(["template:b.html", "template:a.html", "template:b.html"])
+        self.assertEqual(snapshot.items, ["template:a.html", "template:b.html"])
+        self.assertEqual(
+            build_unused_snapshot(["template:b.html", "template:a.html"]).digest, snapshot.digest
+        )
+
+    def test_save_and_compare(self):
+        save_unused_snapshot(self.path, build_unused_snapshot(["view:blog.views.Old", "template:a.html"]))
+        old = load_unused_snapshot(self.path)
+        diff = compare_unused_snapshots(old, build_unused_snapshot(["template:a.html", "template:b.html"]))
+        self.assertEqual(diff.added, ["template:b.html"])
+        self.assertEqual(diff.removed, ["view:blog.views.Old"])
+
+        unchanged = compare_unused_snapshots(old, build_unused_snapshot(old.items))
+        self.assertEqual((unchanged.added, unchanged.removed), ([], []))
+
+    def test_snapshot_not_matching_its_hash_is_ignored(self):
+        save_unused_snapshot(self.path, build_unused_snapshot(["template:a.html"]))
+        with open(self.path) as f:
+            data = json.load(f)
+        data["items"].append("template:b.html")
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        self.assertIsNone(load_unused_snapshot(self.path))
+        self.assertIsNone(load_unused_snapshot(self.path + ".missing"))
+
+    def test_template_id_is_relative(self):
+        self.assertEqual(
+            get_template_id(os.path.join("/project", "blog", "templates", "a.html"), "/project"),
+            "template:blog/templates/a.html",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
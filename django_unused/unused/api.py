@@ -0,0 +1,169 @@
+"""
+Library API for embedding the search in other tools.
+
+Nothing here prints. The searches are generators that yield events as they go, so callers can show
+partial results and stop as soon as they have their answer, either by no longer iterating or by
+setting the cancel event. Django must be set up before the searches run.
+"""
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+from .find_templates import TemplateInfo, find_templates_in_loader_order
+from .scan import scan_file
+from .search_templates import (
+    ReferenceResolver,
+    TemplateFilterOptions,
+    TemplateSearchResult,
+    setup_template_search,
+)
+
+
+@dataclass
+class TemplatesFound:
+    templates: List[TemplateInfo]
+
+
+@dataclass
+class FilesFound:
+    file_paths: List[str]
+
+
+@dataclass
+class FileScanned:
+    file_path: str
+    # The templates this file is the first reference to.
+    newly_used_templates: List[TemplateInfo]
+    scanned_count: int
+    total_count: int
+
+
+@dataclass
+class TemplateSearchFinished:
+    result: TemplateSearchResult
+
+
+@dataclass
+class ViewsFound:
+    views: List[type]
+
+
+@dataclass
+class UnusedViewFound:
+    view: type
+
+
+@dataclass
+class UnroutedViewFound:
+    # A function-based view no URL pattern routes to.
+    view: Callable
+
+
+@dataclass
+class ViewSearchFinished:
+    unused_views: List[type]
+    unrouted_function_views: List[Callable] = field(default_factory=list)
+
+
+def iter_template_search(
+    filter_options: Optional[TemplateFilterOptions] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Iterator[Any]:
+    """
+    Searches for unused templates, yielding TemplatesFound, FilesFound, a FileScanned per file
+    and finally TemplateSearchFinished. Stops without a result once cancel is set.
+    """
+    setup = setup_template_search(find_templates_in_loader_order(), filter_options)
+    yield TemplatesFound(templates=setup.templates)
+
+    all_files = list(setup.file_paths)
+    yield FilesFound(file_paths=all_files)
+
+    resolver = ReferenceResolver(setup.templates, setup.index)
+    for scanned_count, file_path in enumerate(all_files, 1):
+        if cancel is not None and cancel.is_set():
+            return
+        raw_references = scan_file(file_path, setup.basenames, setup.backends.get(file_path))
+        yield FileScanned(
+            file_path=file_path,
+            newly_used_templates=resolver.add_file(file_path, raw_references),
+            scanned_count=scanned_count,
+            total_count=len(all_files),
+        )
+
+    yield TemplateSearchFinished(result=resolver.result())
+
+
+def iter_view_search(cancel: Optional[threading.Event] = None) -> Iterator[Any]:
+    """
+    Searches for unused views, yielding ViewsFound, an UnusedViewFound per unused class-based view,
+    an UnroutedViewFound per unrouted function-based view and finally ViewSearchFinished.
+    Stops without a result once cancel is set.
+    """
+    from .find_urls import get_url_patterns
+    from .find_views import (
+        get_function_views,
+        get_view_files,
+        get_views,
+        is_unrouted_function_view,
+        is_unused_view,
+    )
+
+    view_files = get_view_files()
+    views = get_views(view_files)
+    yield ViewsFound(views=views)
+
+    # One walk of the URL tree serves both kinds of views.
+    routed_view_paths = {p.view_path for p in get_url_patterns()}
+    unused_views = []
+    for view in views:
+        if cancel is not None and cancel.is_set():
+            return
+        if is_unused_view(view, routed_view_paths):
+            unused_views.append(view)
+            yield UnusedViewFound(view=view)
+
+    unrouted_function_views = []
+    for view in get_function_views(view_files):
+        if cancel is not None and cancel.is_set():
+            return
+        if is_unrouted_function_view(view, routed_view_paths):
+            unrouted_function_views.append(view)
+            yield UnroutedViewFound(view=view)
+
+    yield ViewSearchFinished(
+        unused_views=unused_views, unrouted_function_views=unrouted_function_views
+    )
+
+
+async def aiter_events(
+    iter_search: Callable[..., Iterator[Any]], *args: Any, **kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Runs a synchronous search in a worker thread and yields its events without blocking the loop.
+    Closing the async generator, or cancelling the task consuming it, cancels the search.
+    """
+    cancel = threading.Event()
+    events = iter_search(*args, cancel=cancel, **kwargs)
+    loop = asyncio.get_running_loop()
+    done = object()
+    try:
+        while True:
+            event = await loop.run_in_executor(None, next, events, done)
+            if event is done:
+                return
+            yield event
+    finally:
+        # The worker may still be busy with the current file; it stops before the next one.
+        cancel.set()
+
+
+def aiter_template_search(
+    filter_options: Optional[TemplateFilterOptions] = None,
+) -> AsyncIterator[Any]:
+    return aiter_events(iter_template_search, filter_options)
+
+
+def aiter_view_search() -> AsyncIterator[Any]:
+    return aiter_events(iter_view_search)
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+from typing import Any, Iterable, Optional
+
+CACHE_DIR_ENV = "DJANGO_UNUSED_CACHE_DIR"
+DEFAULT_CACHE_DIR = ".django-unused-cache"
+
+
+def get_cache_dir() -> str:
+    return os.environ.get(CACHE_DIR_ENV) or os.path.join(os.getcwd(), DEFAULT_CACHE_DIR)
+
+
+def fingerprint_files(file_paths: Iterable[str]) -> str:
+    """
+    Hashes the paths, sizes and modification times of files; missing files are hashed as missing.
+    """
+    digest = hashlib.sha256()
+    for file_path in sorted(set(file_paths)):
+        try:
+            stat = os.stat(file_path)
+            digest.update(f"{file_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        except OSError:
+            digest.update(f"{file_path}:missing\n".encode())
+    return digest.hexdigest()
+
+
+def fingerprint_values(values: Any) -> str:
+    """
+    Hashes JSON-like data; values JSON cannot represent are hashed by their str().
+    """
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_cache_path(name: str) -> str:
+    return os.path.join(get_cache_dir(), f"{name}.json")
+
+
+def read_cache(name: str, key: str) -> Optional[Any]:
+    """
+    Returns the data cached under name if it was stored with the same key, otherwise None.
+    """
+    try:
+        with open(get_cache_path(name), encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("key") != key:
+        return None
+    return cached.get("data")
+
+
+def write_cache(name: str, key: str, data: Any):
+    path = get_cache_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "data": data}, f)
+    os.replace(tmp_path, path)
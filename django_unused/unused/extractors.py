@@ -0,0 +1,193 @@
+import importlib
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .find_templates import DJANGO_BACKEND, JINJA2_BACKEND, DJANGO_JINJA_BACKEND
+
+DJANGO_REFERENCE_TAGS = {
+    "include": "include",
+    "extends": "extend",
+}
+
+JINJA2_REFERENCE_TAGS = {
+    "include": "include",
+    "extends": "extend",
+    "import": "import",
+    "from": "import",
+}
+
+BLOCK_TAG = "block"
+
+
+@dataclass
+class TemplateTags:
+    # Line number to reference type, for the lines holding a tag that loads another template.
+    reference_types: Dict[int, str] = field(default_factory=dict)
+    # (line number, name) of each {% block %} defined in the template.
+    blocks: List[Tuple[int, str]] = field(default_factory=list)
+
+
+TemplateTagExtractor = Callable[[str], TemplateTags]
+
+
+def extract_django_tags(source: str) -> TemplateTags:
+    """
+    Uses Django's template lexer to find the {% include %}, {% extends %} and {% block %} tags.
+    """
+    from django.template.base import Lexer, TokenType
+
+    tags = TemplateTags()
+    for token in Lexer(source).tokenize():
+        if token.token_type != TokenType.BLOCK:
+            continue
+        bits = token.split_contents()
+        if len(bits) < 2:
+            continue
+        if bits[0] in DJANGO_REFERENCE_TAGS:
+            tags.reference_types[token.lineno] = DJANGO_REFERENCE_TAGS[bits[0]]
+        elif bits[0] == BLOCK_TAG:
+            tags.blocks.append((token.lineno, bits[1]))
+    return tags
+
+
+def extract_jinja2_tags(source: str) -> TemplateTags:
+    """
+    Uses Jinja2's lexer to find the {% include %}, {% extends %}, {% import %}, {% from ... import %}
+    and {% block %} tags. The line of the template name is used, as Jinja2 tags may span lines.
+    Returns no tags when Jinja2 is not installed or the template cannot be lexed.
+    """
+    try:
+        from jinja2 import Environment, TemplateSyntaxError
+    except ImportError:
+        return TemplateTags()
+
+    tags = TemplateTags()
+    pending_type = None
+    pending_block = False
+    after_block_begin = False
+    try:
+        for lineno, token_type, value in Environment().lex(source):
+            if token_type == "whitespace":
+                continue
+            if after_block_begin and token_type == "name":
+                pending_type = JINJA2_REFERENCE_TAGS.get(value)
+                pending_block = value == BLOCK_TAG
+            elif pending_block and token_type == "name":
+                tags.blocks.append((lineno, value))
+                pending_block = False
+            elif pending_type and token_type == "string":
+                tags.reference_types[lineno] = pending_type
+                pending_type = None
+            elif token_type == "block_end":
+                pending_type = None
+                pending_block = False
+            after_block_begin = token_type == "block_begin"
+    except TemplateSyntaxError:
+        return TemplateTags()
+    return tags
+
+
+TEMPLATE_TAG_EXTRACTORS: Dict[str, TemplateTagExtractor] = {
+    DJANGO_BACKEND: extract_django_tags,
+    JINJA2_BACKEND: extract_jinja2_tags,
+    DJANGO_JINJA_BACKEND: extract_jinja2_tags,
+}
+
+
+def determine_reference_type(line: str) -> str:
+    line = line.strip()
+    if "{% include" in line and "%}" in line:
+        return "include"
+    elif "{% extends" in line and "%}" in line:
+        return "extend"
+    else:
+        return "unknown"
+
+
+def extract_template_tags(source: str, backend: str) -> TemplateTags:
+    extractor = TEMPLATE_TAG_EXTRACTORS.get(backend)
+    return extractor(source) if extractor else TemplateTags()
+
+
+# The file type of Python files; templates use their backend as their file type.
+PYTHON_FILE_TYPE = "python"
+
+
+@dataclass
+class ReferenceExtractor:
+    """
+    A plugin that finds template names the token scan cannot see, e.g. names built by a helper.
+    It runs only on the lines of its file types that contain one of its prefilter tokens.
+    """
+    name: str
+    # Substrings a line must contain for extract to run on it, e.g. ("render_email(",).
+    prefilter_tokens: Tuple[str, ...]
+    # Returns the template names referenced in a line.
+    extract: Callable[[str], Iterable[str]]
+    file_types: FrozenSet[str] = frozenset({PYTHON_FILE_TYPE})
+    reference_type: str = "unknown"
+
+
+REFERENCE_EXTRACTORS: List[ReferenceExtractor] = []
+
+
+def register_reference_extractor(extractor: ReferenceExtractor) -> ReferenceExtractor:
+    """
+    Adds an extractor to every following scan. Registering the same name again replaces it.
+    """
+    unregister_reference_extractor(extractor.name)
+    REFERENCE_EXTRACTORS.append(extractor)
+    return extractor
+
+
+def unregister_reference_extractor(name: str):
+    REFERENCE_EXTRACTORS[:] = [e for e in REFERENCE_EXTRACTORS if e.name != name]
+
+
+def get_reference_extractors(file_type: str) -> List[ReferenceExtractor]:
+    return [e for e in REFERENCE_EXTRACTORS if file_type in e.file_types]
+
+
+def regex_extractor(
+    name: str,
+    pattern: str,
+    template_format: str = "{}",
+    prefilter_tokens: Optional[Tuple[str, ...]] = None,
+    file_types: FrozenSet[str] = frozenset({PYTHON_FILE_TYPE}),
+    reference_type: Optional[str] = None,
+) -> ReferenceExtractor:
+    """
+    Builds an extractor that formats the first group of each match of pattern into a template name,
+    e.g. regex_extractor("render_email", r"render_email\\(\\s*[\"']([\\w/-]+)", "emails/{}.html").
+    :param prefilter_tokens: Defaults to the name.
+    """
+    compiled = re.compile(pattern)
+
+    def extract(line: str) -> List[str]:
+        return [template_format.format(m.group(1)) for m in compiled.finditer(line)]
+
+    return ReferenceExtractor(
+        name=name,
+        prefilter_tokens=prefilter_tokens or (name,),
+        extract=extract,
+        file_types=file_types,
+        reference_type=reference_type or name,
+    )
+
+
+def load_reference_extractors(dotted_paths: Optional[Iterable[str]] = None):
+    """
+    Registers the extractors at the given dotted paths. Registering them again is harmless.
+    :param dotted_paths: Defaults to the UNUSED_REFERENCE_EXTRACTORS setting.
+    """
+    if dotted_paths is None:
+        from django.conf import settings
+
+        # Without settings, e.g. in a search that reads settings modules itself, there are none.
+        if not settings.configured:
+            return
+        dotted_paths = getattr(settings, "UNUSED_REFERENCE_EXTRACTORS", [])
+    for dotted_path in dotted_paths:
+        module_name, _, attribute = dotted_path.rpartition(".")
+        register_reference_extractor(getattr(importlib.import_module(module_name), attribute))
@@ -0,0 +1,217 @@
+import ast
+import io
+import os
+import re
+import tokenize
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.apps import apps
+from django.apps.config import AppConfig
+
+from .prefetch import prefetch_files
+
+MODEL_SYMBOL = "model"
+FIELD_SYMBOL = "field"
+COMMAND_SYMBOL = "command"
+
+IDENTIFIER_RE = re.compile(r"[A-Za-z_]\w*")
+
+# Tokens after which a name is being defined rather than used.
+DEFINITION_KEYWORDS = {"class", "def"}
+STATEMENT_START_TOKENS = {tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT}
+
+
+@dataclass
+class ModelSymbol:
+    kind: str
+    # What is reported, e.g. "blog.Article", "blog.Article.title" or "import_articles".
+    label: str
+    # The model a field belongs to, so that the fields of unused models are not reported twice.
+    model_label: Optional[str] = None
+    file_path: str = ""
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.kind, self.label
+
+
+@dataclass
+class SymbolTable:
+    # Identifier to the models and fields it may refer to.
+    names: Dict[str, List[ModelSymbol]] = field(default_factory=lambda: defaultdict(list))
+    # String literal to the management commands it may call.
+    strings: Dict[str, List[ModelSymbol]] = field(default_factory=lambda: defaultdict(list))
+    symbols: List[ModelSymbol] = field(default_factory=list)
+
+    def add_name(self, names: Iterable[str], symbol: ModelSymbol):
+        self.symbols.append(symbol)
+        for name in set(names):
+            self.names[name].append(symbol)
+
+    def add_string(self, string: str, symbol: ModelSymbol):
+        self.symbols.append(symbol)
+        self.strings[string].append(symbol)
+
+
+@dataclass
+class ModelSearchResult:
+    unused_models: List[ModelSymbol]
+    unused_fields: List[ModelSymbol]
+    unused_commands: List[ModelSymbol]
+
+
+def get_project_models(app_configs: List[AppConfig]) -> list:
+    return [m for m in apps.get_models() if m._meta.app_config in app_configs]
+
+
+def find_management_commands(app_configs: List[AppConfig]) -> List[Tuple[str, str]]:
+    """
+    Returns the name and file of each management command of the apps,
+    following Django's rule that modules starting with an underscore are not commands.
+    """
+    commands = []
+    for config in app_configs:
+        commands_dir = os.path.join(str(config.path), "management", "commands")
+        if not os.path.isdir(commands_dir):
+            continue
+        for filename in sorted(os.listdir(commands_dir)):
+            name, extension = os.path.splitext(filename)
+            if extension == ".py" and not name.startswith("_"):
+                commands.append((name, os.path.join(commands_dir, filename)))
+    return commands
+
+
+def build_symbol_table(models: list, commands: List[Tuple[str, str]]) -> SymbolTable:
+    """
+    Indexes each model by its class name, its model name and its default reverse accessor,
+    each field by its name and attribute name, and each management command by its name.
+    """
+    table = SymbolTable()
+    for model in models:
+        opts = model._meta
+        model_label = f"{opts.app_label}.{model.__name__}"
+        table.add_name(
+            [model.__name__, opts.model_name, f"{opts.model_name}_set"],
+            ModelSymbol(kind=MODEL_SYMBOL, label=model_label),
+        )
+        for model_field in list(opts.local_fields) + list(opts.local_many_to_many):
+            # The automatic primary key is used by Django itself.
+            if model_field.auto_created:
+                continue
+            table.add_name(
+                [model_field.name, model_field.attname],
+                ModelSymbol(
+                    kind=FIELD_SYMBOL,
+                    label=f"{model_label}.{model_field.name}",
+                    model_label=model_label,
+                ),
+            )
+    for name, file_path in commands:
+        table.add_string(name, ModelSymbol(kind=COMMAND_SYMBOL, label=name, file_path=file_path))
+    return table
+
+
+def is_dunder(word: str) -> bool:
+    return len(word) > 4 and word.startswith("__") and word.endswith("__")
+
+
+def split_lookups(words: Iterable[str]) -> Set[str]:
+    """
+    Splits ORM lookups like author__name__icontains into the names they are made of.
+    Python's own dunder names, e.g. __name__ or __class__, are dropped: they are not lookups,
+    and splitting them would turn __name__ into a use of every field called name.
+    """
+    return {
+        part
+        for word in words
+        if not is_dunder(word)
+        for part in word.split("__")
+        if part
+    }
+
+
+def extract_python_symbols(source: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Tokenizes Python code once, skipping comments and the names being defined.
+    :return: The names used, including the identifiers inside strings such as values("field")
+        or order_by("-author__name"), and the string literals.
+    """
+    tokens: List[tokenize.TokenInfo] = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type not in (tokenize.NL, tokenize.COMMENT):
+                tokens.append(token)
+    except (tokenize.TokenError, SyntaxError):
+        # Keep the names found before the error.
+        pass
+
+    words: Set[str] = set()
+    strings: Set[str] = set()
+    for i, token in enumerate(tokens):
+        if token.type == tokenize.NAME:
+            previous = tokens[i - 1] if i else None
+            if previous is not None and previous.string in DEFINITION_KEYWORDS:
+                continue
+            # A class attribute or variable being assigned, e.g. title = models.CharField(...).
+            is_statement_start = previous is None or previous.type in STATEMENT_START_TOKENS
+            if is_statement_start and i + 1 < len(tokens) and tokens[i + 1].string == "=":
+                continue
+            words.add(token.string)
+        elif token.type == tokenize.STRING:
+            try:
+                value = ast.literal_eval(token.string)
+            except (SyntaxError, ValueError):
+                continue
+            if isinstance(value, str):
+                strings.add(value)
+                words.update(IDENTIFIER_RE.findall(value))
+    return split_lookups(words), strings
+
+
+def extract_template_symbols(source: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Templates look fields up with dots, e.g. {{ article.author.name }}, so every identifier is a name.
+    """
+    return split_lookups(IDENTIFIER_RE.findall(source)), set()
+
+
+def is_migration_file(file_path: str) -> bool:
+    return "migrations" in file_path.replace("\\", "/").split("/")
+
+
+def search_unused_model_symbols(
+    table: SymbolTable,
+    file_paths: Iterable[str],
+    template_files: Set[str],
+    max_in_flight: int = 1,
+) -> ModelSearchResult:
+    """
+    Reads each file once and looks each distinct name up in the symbol table,
+    so the work grows with the size of the code, not with the number of models times lines.
+    Migrations are skipped, as they mention every field.
+    :param template_files: The file paths that are templates; other files are scanned as Python.
+    :param max_in_flight: How many files are read ahead on a thread pool while earlier ones are scanned.
+    """
+    used: Set[Tuple[str, str]] = set()
+    file_paths = (f for f in file_paths if not is_migration_file(f))
+    for file_path, source in prefetch_files(file_paths, max_in_flight):
+        if file_path in template_files:
+            names, strings = extract_template_symbols(source)
+        else:
+            names, strings = extract_python_symbols(source)
+        for name in names:
+            used.update(s.key for s in table.names.get(name, ()))
+        for string in strings:
+            used.update(s.key for s in table.strings.get(string, ()))
+
+    unused = [s for s in table.symbols if s.key not in used]
+    unused_model_labels = {s.label for s in unused if s.kind == MODEL_SYMBOL}
+    return ModelSearchResult(
+        unused_models=[s for s in unused if s.kind == MODEL_SYMBOL],
+        unused_fields=[
+            s for s in unused if s.kind == FIELD_SYMBOL and s.model_label not in unused_model_labels
+        ],
+        unused_commands=[s for s in unused if s.kind == COMMAND_SYMBOL],
+    )
@@ -1,20 +1,40 @@
 import os
+import posixpath
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from django.apps import apps
 from django.apps.config import AppConfig
 from django.conf import settings
 
 
+DJANGO_BACKEND = "django.template.backends.django.DjangoTemplates"
+JINJA2_BACKEND = "django.template.backends.jinja2.Jinja2"
+DJANGO_JINJA_BACKEND = "django_jinja.backend.Jinja2"
+
+# The directory each backend looks for inside an app when APP_DIRS is set.
+APP_TEMPLATE_DIRNAMES = {
+    DJANGO_BACKEND: "templates",
+    JINJA2_BACKEND: "jinja2",
+    DJANGO_JINJA_BACKEND: "templates",
+}
+
+FILESYSTEM_LOADER = "django.template.loaders.filesystem.Loader"
+APP_DIRECTORIES_LOADER = "django.template.loaders.app_directories.Loader"
+CACHED_LOADER = "django.template.loaders.cached.Loader"
+
+
 @dataclass
 class TemplateInfo:
     file_path: str
     template_path: str
     app_config: Optional[AppConfig]
+    backend: str = DJANGO_BACKEND
 
 
-def find_templates_in_directory(dir_path: str, app_config: Optional[AppConfig] = None) -> List[TemplateInfo]:
+def find_templates_in_directory(
+    dir_path: str, app_config: Optional[AppConfig] = None, backend: str = DJANGO_BACKEND
+) -> List[TemplateInfo]:
     templates: List[TemplateInfo] = []
     for root, dirs, files in os.walk(dir_path):
         for file in files:
@@ -25,6 +45,7 @@ def find_templates_in_directory(dir_path: str, app_config: Optional[AppConfig] =
                     file_path=file_path,
                     template_path=template_path,
                     app_config=app_config,
+                    backend=backend,
                 )
             )
     return templates
@@ -47,31 +68,241 @@ def find_global_templates() -> List[TemplateInfo]:
 
     if settings.TEMPLATES:
         for template_backend in settings.TEMPLATES:
+            backend = template_backend.get("BACKEND", DJANGO_BACKEND)
             for directory in template_backend.get("DIRS", []):
-                templates.extend(find_templates_in_directory(directory))
+                templates.extend(find_templates_in_directory(directory, backend=backend))
 
     return templates
 
 
-def find_py_files(exclude_dirs: List[str] = None) -> Tuple[List[str], List[str]]:
+def _flatten_loaders(loaders: Iterable[Any]) -> List[Tuple[str, Optional[List[str]]]]:
+    flattened: List[Tuple[str, Optional[List[str]]]] = []
+    for loader in loaders:
+        if isinstance(loader, (list, tuple)):
+            name, args = loader[0], list(loader[1:])
+            if name == CACHED_LOADER and args:
+                # The cached loader only wraps its children; their order is what counts.
+                flattened.extend(_flatten_loaders(args[0]))
+            elif name == FILESYSTEM_LOADER and args:
+                flattened.append((name, list(args[0])))
+            else:
+                flattened.append((name, None))
+        else:
+            flattened.append((loader, None))
+    return flattened
+
+
+def get_template_loaders(template_backend: Dict[str, Any]) -> List[Tuple[str, Optional[List[str]]]]:
+    """
+    Returns the loaders of a TEMPLATES entry in the order Django queries them.
+    Each loader is a (dotted path, directories) tuple, where directories is only set when a
+    filesystem loader was configured with its own list of directories.
+    """
+    loaders = template_backend.get("OPTIONS", {}).get("loaders")
+    if loaders is None:
+        loaders = [FILESYSTEM_LOADER]
+        if template_backend.get("APP_DIRS"):
+            loaders.append(APP_DIRECTORIES_LOADER)
+    return _flatten_loaders(loaders)
+
+
+def get_backend_template_dirs(
+    template_backend: Dict[str, Any], app_configs: List[AppConfig]
+) -> List[Tuple[str, Optional[AppConfig]]]:
+    """
+    Returns the (directory, app config) pairs a TEMPLATES entry searches, in search order.
+    Django backends follow their loaders; Jinja2 backends search DIRS, then each app's directory.
+    """
+    backend = template_backend.get("BACKEND", DJANGO_BACKEND)
+    app_dirname = APP_TEMPLATE_DIRNAMES.get(backend, "templates")
+    app_dirs = [
+        (os.path.join(str(config.path), app_dirname), config) for config in app_configs
+    ]
+    global_dirs = [(str(d), None) for d in template_backend.get("DIRS", [])]
+
+    if backend != DJANGO_BACKEND:
+        return global_dirs + (app_dirs if template_backend.get("APP_DIRS") else [])
+
+    dirs: List[Tuple[str, Optional[AppConfig]]] = []
+    for loader, loader_dirs in get_template_loaders(template_backend):
+        if loader == FILESYSTEM_LOADER:
+            dirs.extend(
+                global_dirs if loader_dirs is None else [(str(d), None) for d in loader_dirs]
+            )
+        elif loader == APP_DIRECTORIES_LOADER:
+            dirs.extend(app_dirs)
+    return dirs
+
+
+def get_project_app_configs() -> List[AppConfig]:
+    """
+    Returns the app configs of the user-created apps, i.e. the apps inside BASE_DIR.
+    """
+    return [
+        config
+        for config in apps.get_app_configs()
+        if str(config.path).find(str(settings.BASE_DIR)) > -1
+    ]
+
+
+def find_templates_in_loader_order(
+    template_settings: Optional[List[Dict[str, Any]]] = None,
+    app_configs: Optional[List[AppConfig]] = None,
+) -> List[TemplateInfo]:
+    """
+    Returns every template file in the order Django would find them:
+    backend by backend, loader by loader, directory by directory.
+    A file reachable through several backends or loaders is only listed at its first position.
+    :param template_settings: A TEMPLATES setting, defaults to settings.TEMPLATES.
+    :param app_configs: The project apps, defaults to get_project_app_configs().
+    """
+    return find_templates_in_directories(get_template_dirs(template_settings, app_configs))
+
+
+def get_template_dirs(
+    template_settings: Optional[List[Dict[str, Any]]] = None,
+    app_configs: Optional[List[AppConfig]] = None,
+) -> List[Tuple[str, Optional[AppConfig], str]]:
+    """
+    Returns the (directory, app config, backend) triples of all backends, in search order.
+    :param template_settings: A TEMPLATES setting, defaults to settings.TEMPLATES.
+    :param app_configs: The project apps, defaults to get_project_app_configs().
+    """
+    if template_settings is None:
+        template_settings = settings.TEMPLATES
+    if app_configs is None:
+        app_configs = get_project_app_configs()
+
+    template_dirs: List[Tuple[str, Optional[AppConfig], str]] = []
+    for template_backend in template_settings or []:
+        backend = template_backend.get("BACKEND", DJANGO_BACKEND)
+        for directory, app_config in get_backend_template_dirs(template_backend, app_configs):
+            template_dirs.append((directory, app_config, backend))
+    return template_dirs
+
+
+def find_templates_in_directories(
+    template_dirs: Iterable[Tuple[str, Optional[AppConfig], str]]
+) -> List[TemplateInfo]:
+    """
+    Lists the templates of each (directory, app config, backend) triple, in order.
+    A file in several of the directories is only listed at its first position.
+    """
+    templates: List[TemplateInfo] = []
+    seen_files = set()
+    for directory, app_config, backend in template_dirs:
+        for template in find_templates_in_directory(directory, app_config, backend):
+            if template.file_path not in seen_files:
+                seen_files.add(template.file_path)
+                templates.append(template)
+    return templates
+
+
+def build_template_index(templates: List[TemplateInfo]) -> Dict[str, TemplateInfo]:
+    """
+    Maps each template name to the file Django would render for it.
+    templates must be in loader order; later files with the same name are shadowed.
+    """
+    index: Dict[str, TemplateInfo] = {}
+    for template in templates:
+        index.setdefault(template.template_path, template)
+    return index
+
+
+def find_shadowed_templates(templates: List[TemplateInfo], index: Dict[str, TemplateInfo]) -> List[TemplateInfo]:
+    return [
+        t for t in templates if index[t.template_path].file_path != t.file_path
+    ]
+
+
+def build_basename_index(index: Dict[str, TemplateInfo]) -> Dict[str, List[str]]:
+    """
+    Maps each basename (e.g. "list.html") to the template names that end with it.
+    """
+    basename_index: Dict[str, List[str]] = {}
+    for name in index:
+        basename_index.setdefault(posixpath.basename(name), []).append(name)
+    return basename_index
+
+
+def resolve_template_name(
+    token: str,
+    index: Dict[str, TemplateInfo],
+    basename_index: Dict[str, List[str]],
+    referencing_path: Optional[str] = None,
+) -> Optional[Tuple[str, int]]:
+    """
+    Resolves a token found in a file to a template name in index.
+    Returns the name and how many templates it could have referred to, or None.
+    :param token: A path-like token, e.g. "app1/list.html", "./form.html" or "list.html".
+    :param referencing_path: The template name of the referencing file, if it is a template.
+    """
+    if token.startswith(("./", "../")):
+        if referencing_path is None:
+            return None
+        name = posixpath.normpath(
+            posixpath.join(posixpath.dirname(referencing_path), token)
+        )
+        return (name, 1) if name in index else None
+
+    if token in index:
+        return token, 1
+
+    if "/" in token:
+        # Paths with a prefix, e.g. "templates/app1/list.html" or an absolute file path.
+        position = token.find("/")
+        while position > -1:
+            suffix = token[position + 1:]
+            if suffix in index:
+                return suffix, 1
+            position = token.find("/", position + 1)
+        return None
+
+    candidates = basename_index.get(token)
+    if not candidates:
+        return None
+    if referencing_path is not None:
+        sibling = posixpath.join(posixpath.dirname(referencing_path), token)
+        if sibling in index:
+            return sibling, len(candidates)
+    if len(candidates) == 1:
+        return candidates[0], 1
+    # An ambiguous bare basename could be any of the candidates, so it counts for none of them.
+    return None
+
+
+def iter_py_files(
+    exclude_dirs: List[str] = None, app_configs: Optional[List[AppConfig]] = None
+) -> Iterator[Tuple[str, str]]:
+    """
+    Walks the apps lazily, yielding the path of each Python file and its path relative to its app,
+    so that files can be read while the walk is still running.
+    """
     if exclude_dirs is None:
         exclude_dirs = [os.path.join("example", "server", "tests")]
+    if app_configs is None:
+        app_configs = get_project_app_configs()
 
-    pys: List[str] = []
-    py_files: List[str] = []
     python_extensions = ["py"]
 
-    for config in apps.get_app_configs():
-        if str(config.path).find(str(settings.BASE_DIR)) > -1:
-            dir_path = str(config.path)
-            for root, dirs, files in os.walk(dir_path):
-                if any(exclude_dir in root for exclude_dir in exclude_dirs):
-                    print(f"excluding: {root}")
-                    continue
-                for file in files:
-                    filename, extension = os.path.splitext(file)
-                    if extension[1:] in python_extensions:
-                        py_file = os.path.join(root, file)
-                        py_files.append(py_file)
-                        pys.append(py_file.replace(dir_path, "")[1:])
+    for config in app_configs:
+        dir_path = str(config.path)
+        for root, dirs, files in os.walk(dir_path):
+            if any(exclude_dir in root for exclude_dir in exclude_dirs):
+                continue
+            for file in files:
+                filename, extension = os.path.splitext(file)
+                if extension[1:] in python_extensions:
+                    py_file = os.path.join(root, file)
+                    yield py_file, py_file.replace(dir_path, "")[1:]
+
+
+def find_py_files(
+    exclude_dirs: List[str] = None, app_configs: Optional[List[AppConfig]] = None
+) -> Tuple[List[str], List[str]]:
+    pys: List[str] = []
+    py_files: List[str] = []
+    for py_file, py in iter_py_files(exclude_dirs, app_configs):
+        py_files.append(py_file)
+        pys.append(py)
     return py_files, pys
@@ -0,0 +1,266 @@
+import ast
+import io
+import os
+import tokenize
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.apps.config import AppConfig
+from django.conf import settings
+
+from .find_templates import DJANGO_BACKEND, DJANGO_JINJA_BACKEND, JINJA2_BACKEND
+from .prefetch import prefetch_files
+
+# Only the catalog of Python code and templates is checked; djangojs.po is used by JavaScript.
+PO_FILE_NAME = "django.po"
+
+# The translation functions and the number of context arguments before the msgid.
+GETTEXT_FUNCTIONS = {
+    "_": 0,
+    "gettext": 0,
+    "gettext_lazy": 0,
+    "gettext_noop": 0,
+    "ugettext": 0,
+    "ugettext_lazy": 0,
+    "ugettext_noop": 0,
+    "ngettext": 0,
+    "ngettext_lazy": 0,
+    "ungettext": 0,
+    "ungettext_lazy": 0,
+    "pgettext": 1,
+    "pgettext_lazy": 1,
+    "npgettext": 1,
+    "npgettext_lazy": 1,
+}
+
+# (msgctxt, msgid), which is how gettext looks a message up.
+MessageKey = Tuple[Optional[str], str]
+
+
+@dataclass
+class PoEntry:
+    msgid: str
+    msgctxt: Optional[str]
+    file_path: str
+    line_number: int
+
+    @property
+    def key(self) -> MessageKey:
+        return self.msgctxt, self.msgid
+
+
+@dataclass
+class TranslationSearchResult:
+    unused_entries: List[PoEntry]
+    used_messages: Set[MessageKey]
+
+
+def find_po_files(app_configs: List[AppConfig], locale_paths: Optional[List[str]] = None) -> List[str]:
+    """
+    Returns the django.po files in LOCALE_PATHS and in the locale directory of each app.
+    """
+    if locale_paths is None:
+        locale_paths = [str(p) for p in getattr(settings, "LOCALE_PATHS", [])]
+    locale_dirs = locale_paths + [os.path.join(str(c.path), "locale") for c in app_configs]
+
+    po_files = []
+    for locale_dir in locale_dirs:
+        for root, dirs, files in os.walk(locale_dir):
+            if os.path.basename(root) == "LC_MESSAGES" and PO_FILE_NAME in files:
+                po_files.append(os.path.join(root, PO_FILE_NAME))
+    return po_files
+
+
+def parse_po_string(line: str) -> str:
+    # PO strings use C escapes, which are the same as Python's for everything gettext writes.
+    return ast.literal_eval(line)
+
+
+def parse_po_source(source: str, file_path: str = "") -> List[PoEntry]:
+    """
+    Reads the msgid and msgctxt of each entry. The header and obsolete (#~) entries are skipped.
+    """
+    entries: List[PoEntry] = []
+    fields: Dict[str, str] = {}
+    current = None
+    msgid_line = 0
+
+    def finish_entry():
+        if fields.get("msgid"):
+            entries.append(
+                PoEntry(
+                    msgid=fields["msgid"],
+                    msgctxt=fields.get("msgctxt"),
+                    file_path=file_path,
+                    line_number=msgid_line,
+                )
+            )
+        fields.clear()
+
+    for line_number, line in enumerate(source.split("\n"), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            current = None
+            continue
+        if line.startswith('"'):
+            if current:
+                fields[current] += parse_po_string(line)
+            continue
+        keyword, _, value = line.partition(" ")
+        if keyword in ("msgctxt", "msgid"):
+            # An entry starts at its msgctxt, or at its msgid if it has none.
+            if keyword == "msgctxt" or "msgctxt" not in fields or "msgid" in fields:
+                finish_entry()
+            if keyword == "msgid":
+                msgid_line = line_number
+        fields[keyword] = parse_po_string(value)
+        current = keyword
+    finish_entry()
+    return entries
+
+
+def parse_po_file(file_path: str) -> List[PoEntry]:
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        return parse_po_source(f.read(), file_path)
+
+
+def read_string_arguments(tokens: List[tokenize.TokenInfo], start: int, count: int) -> Optional[List[str]]:
+    """
+    Reads count string literal arguments of a call, starting after its opening parenthesis.
+    Adjacent literals are concatenated like Python does. Returns None if an argument is not a literal.
+    """
+    arguments: List[str] = []
+    i = start
+    while len(arguments) < count:
+        value = None
+        while i < len(tokens) and tokens[i].type == tokenize.STRING:
+            try:
+                literal = ast.literal_eval(tokens[i].string)
+            except (SyntaxError, ValueError):
+                return None
+            if not isinstance(literal, str):
+                return None
+            value = literal if value is None else value + literal
+            i += 1
+        if value is None:
+            return None
+        arguments.append(value)
+        if len(arguments) < count:
+            if i >= len(tokens) or tokens[i].string != ",":
+                return None
+            i += 1
+    return arguments
+
+
+def get_python_tokens(source: str) -> List[tokenize.TokenInfo]:
+    """
+    Tokenizes Python source without the comments and the line breaks inside brackets,
+    so that the arguments of a call follow it whichever way it is wrapped.
+    """
+    tokens: List[tokenize.TokenInfo] = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type not in (tokenize.NL, tokenize.COMMENT):
+                tokens.append(token)
+    except (tokenize.TokenError, SyntaxError):
+        # Keep the tokens read before the error.
+        pass
+    return tokens
+
+
+def extract_python_translations(source: str) -> Set[MessageKey]:
+    """
+    Finds the literal messages passed to the gettext functions, using Python's tokenizer
+    so that strings, comments and implicit concatenation are handled like the compiler does.
+    """
+    tokens = get_python_tokens(source)
+    messages: Set[MessageKey] = set()
+    for i, token in enumerate(tokens[:-1]):
+        if token.type != tokenize.NAME or token.string not in GETTEXT_FUNCTIONS:
+            continue
+        if tokens[i + 1].string != "(" or (i > 0 and tokens[i - 1].string == "def"):
+            continue
+        context_count = GETTEXT_FUNCTIONS[token.string]
+        arguments = read_string_arguments(tokens, i + 2, context_count + 1)
+        if arguments:
+            messages.add((arguments[0] if context_count else None, arguments[-1]))
+    return messages
+
+
+def extract_django_template_translations(source: str) -> Set[MessageKey]:
+    """
+    Finds the messages of {% trans %}, {% blocktrans %} and _() in a Django template.
+    The template is converted the way makemessages does, so the msgids match the .po files exactly.
+    """
+    from django.utils.translation.template import templatize
+
+    try:
+        return extract_python_translations(templatize(source))
+    except Exception:
+        # templatize raises on malformed blocktrans tags, which makemessages would reject too.
+        return set()
+
+
+def extract_jinja2_translations(source: str) -> Set[MessageKey]:
+    """
+    Finds the messages of {% trans %} and the gettext calls in a Jinja2 template.
+    Returns no messages when Jinja2 is not installed or the template cannot be parsed.
+    """
+    try:
+        from jinja2 import Environment, TemplateSyntaxError
+    except ImportError:
+        return set()
+
+    environment = Environment(extensions=["jinja2.ext.i18n"])
+    messages: Set[MessageKey] = set()
+    try:
+        for _, function, message in environment.extract_translations(source):
+            if isinstance(message, str):
+                messages.add((None, message))
+            elif function in ("pgettext", "npgettext"):
+                if message[0] is not None and message[1] is not None:
+                    messages.add((message[0], message[1]))
+            elif message and message[0] is not None:
+                messages.add((None, message[0]))
+    except TemplateSyntaxError:
+        return set()
+    return messages
+
+
+TRANSLATION_EXTRACTORS = {
+    DJANGO_BACKEND: extract_django_template_translations,
+    JINJA2_BACKEND: extract_jinja2_translations,
+    DJANGO_JINJA_BACKEND: extract_jinja2_translations,
+}
+
+
+def extract_translations(source: str, backend: Optional[str] = None) -> Set[MessageKey]:
+    """
+    :param backend: The template backend of the file, or None for Python files.
+    """
+    return TRANSLATION_EXTRACTORS.get(backend, extract_python_translations)(source)
+
+
+def search_unused_translations(
+    po_files: Iterable[str],
+    file_paths: Iterable[str],
+    backends: Dict[str, str],
+    max_in_flight: int = 1,
+) -> TranslationSearchResult:
+    """
+    Collects the messages used by every file into one set, so that each .po entry is checked
+    with a single lookup however many messages and files there are.
+    :param backends: The template backend of each template file; other files are scanned as Python.
+    :param max_in_flight: How many files are read ahead on a thread pool while earlier ones are scanned.
+    """
+    used_messages: Set[MessageKey] = set()
+    for file_path, source in prefetch_files(file_paths, max_in_flight):
+        used_messages |= extract_translations(source, backends.get(file_path))
+
+    unused_entries = [
+        entry
+        for po_file in po_files
+        for entry in parse_po_file(po_file)
+        if entry.key not in used_messages
+    ]
+    return TranslationSearchResult(unused_entries=unused_entries, used_messages=used_messages)
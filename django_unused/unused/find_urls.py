@@ -0,0 +1,198 @@
+import inspect
+import os
+import re
+import tokenize
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+from .find_templates import DJANGO_BACKEND
+from .find_translations import get_python_tokens, read_string_arguments
+from .prefetch import prefetch_files
+
+# The Python functions that look the URL name passed as their first argument up.
+# url() is left out: in Python code it defines a URL pattern rather than reversing one.
+URL_NAME_FUNCTIONS = {"reverse", "reverse_lazy", "redirect", "resolve_url"}
+# The keyword arguments and attributes that hold a URL name, e.g. RedirectView's pattern_name.
+URL_NAME_KEYWORDS = {"pattern_name", "viewname"}
+
+# {% url "name" %} in Django templates.
+DJANGO_URL_TAG_RE = re.compile(r"""\{%-?\s*url\s+(["'])(.+?)\1""")
+# url("name") in Jinja2 templates; the arguments may be wrapped over several lines.
+JINJA2_URL_CALL_RE = re.compile(r"""\burl\s*\(\s*(["'])(.+?)\1""")
+
+
+@dataclass
+class UrlPatternInfo:
+    # The name to reverse, including namespaces, e.g. "blog:detail"; None for unnamed patterns.
+    name: Optional[str]
+    pattern: str
+    # The dotted path of the view, which identifies it without importing it, e.g. in the cache.
+    view_path: str
+    # Whether the view is defined in a user-created app.
+    is_project: bool = False
+    callback: Optional[Callable] = None
+    # The view behind the callback: the class of an as_view() callback, or the undecorated function.
+    view: Any = None
+
+
+def get_view_path(view: Any) -> str:
+    return f"{view.__module__}.{view.__qualname__}"
+
+
+def unwrap_callback(callback: Callable) -> Any:
+    view_class = getattr(callback, "view_class", None)
+    if view_class is not None:
+        return view_class
+    return inspect.unwrap(callback)
+
+
+def add_urlconf_file(resolver, urlconf_files: List[str]):
+    # include() of a list of patterns has no module of its own.
+    module_file = getattr(resolver.urlconf_module, "__file__", None)
+    if module_file and module_file not in urlconf_files:
+        urlconf_files.append(module_file)
+
+
+def walk_url_patterns(
+    url_patterns,
+    namespace: Optional[str] = None,
+    prefix: str = "",
+    base_dir: Optional[str] = None,
+    urlconf_files: Optional[List[str]] = None,
+) -> List[UrlPatternInfo]:
+    """
+    Flattens nested urlpatterns in one walk, keeping each pattern's full name and route.
+    :param base_dir: The project directory; the views inside it are the project's own.
+    :param urlconf_files: If given, the source files of the included urlconfs are added to it.
+    """
+    patterns: List[UrlPatternInfo] = []
+    for entry in url_patterns:
+        route = prefix + str(entry.pattern)
+        if hasattr(entry, "url_patterns"):
+            if urlconf_files is not None:
+                add_urlconf_file(entry, urlconf_files)
+            entry_namespace = getattr(entry, "namespace", None)
+            if entry_namespace:
+                entry_namespace = f"{namespace}:{entry_namespace}" if namespace else entry_namespace
+            else:
+                entry_namespace = namespace
+            patterns.extend(
+                walk_url_patterns(
+                    entry.url_patterns, entry_namespace, route, base_dir, urlconf_files
+                )
+            )
+        else:
+            name = entry.name
+            if name and namespace:
+                name = f"{namespace}:{name}"
+            view = unwrap_callback(entry.callback)
+            patterns.append(
+                UrlPatternInfo(
+                    name=name,
+                    pattern=route,
+                    view_path=get_view_path(view),
+                    is_project=bool(base_dir) and is_project_view(view, base_dir),
+                    callback=entry.callback,
+                    view=view,
+                )
+            )
+    return patterns
+
+
+def walk_root_urlconf() -> Tuple[List[UrlPatternInfo], List[str]]:
+    """
+    Imports the URL tree and walks it once.
+    :return: The URL patterns, and the source files of the root urlconf and every urlconf it includes.
+    """
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    urlconf_files: List[str] = []
+    add_urlconf_file(resolver, urlconf_files)
+    url_patterns = walk_url_patterns(
+        resolver.url_patterns, base_dir=str(settings.BASE_DIR), urlconf_files=urlconf_files
+    )
+    return url_patterns, urlconf_files
+
+
+def get_url_patterns() -> List[UrlPatternInfo]:
+    return walk_root_urlconf()[0]
+
+
+def get_urlconf_files() -> List[str]:
+    return walk_root_urlconf()[1]
+
+
+def is_project_view(view: Any, base_dir: str) -> bool:
+    """
+    Whether a view is defined in a user-created app, i.e. inside base_dir.
+    """
+    module = inspect.getmodule(view)
+    module_file = getattr(module, "__file__", None)
+    if not module_file:
+        return False
+    return os.path.abspath(module_file).find(base_dir) > -1
+
+
+def extract_python_url_names(source: str) -> Set[str]:
+    """
+    Finds the literal URL names passed to the reversing functions, or assigned to the URL name
+    keywords. The whole argument list is read, however the call is wrapped.
+    """
+    tokens = get_python_tokens(source)
+    url_names: Set[str] = set()
+    for i, token in enumerate(tokens[:-1]):
+        if token.type != tokenize.NAME:
+            continue
+        if token.string in URL_NAME_FUNCTIONS and tokens[i + 1].string == "(":
+            if i > 0 and tokens[i - 1].string == "def":
+                continue
+        elif not (token.string in URL_NAME_KEYWORDS and tokens[i + 1].string == "="):
+            continue
+        arguments = read_string_arguments(tokens, i + 2, 1)
+        if arguments:
+            url_names.add(arguments[0])
+    return url_names
+
+
+def extract_url_names(source: str, backend: Optional[str] = None) -> Set[str]:
+    """
+    :param backend: The template backend of the file, or None for Python files.
+    """
+    if backend is None:
+        return extract_python_url_names(source)
+    url_re = DJANGO_URL_TAG_RE if backend == DJANGO_BACKEND else JINJA2_URL_CALL_RE
+    return {m.group(2) for m in url_re.finditer(source)}
+
+
+def find_used_url_names(
+    url_names: Set[str],
+    file_paths: Iterable[str],
+    backends: Dict[str, str],
+    max_in_flight: int = 1,
+) -> Set[str]:
+    """
+    Returns the URL names that a file reverses.
+    :param backends: The template backend of each template file; other files are read as Python.
+    :param max_in_flight: How many files are read ahead on a thread pool while earlier ones are searched.
+    """
+    used: Set[str] = set()
+    for file_path, source in prefetch_files(file_paths, max_in_flight):
+        used |= extract_url_names(source, backends.get(file_path)) & url_names
+    return used
+
+
+def find_unused_url_patterns(
+    url_patterns: List[UrlPatternInfo], used_url_names: Set[str]
+) -> List[UrlPatternInfo]:
+    """
+    Returns the named URL patterns of the project's views whose name is never reversed.
+    Patterns of third-party views, e.g. the admin, are skipped.
+    """
+    return [
+        p
+        for p in url_patterns
+        if p.name and p.name not in used_url_names and p.is_project
+    ]
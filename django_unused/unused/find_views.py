@@ -6,6 +6,8 @@ from django.apps import apps
 from django.conf import settings
 from django.views.generic import View
 
+from .find_urls import get_view_path
+
 
 def get_view_files():
     """
@@ -91,6 +93,50 @@ def get_views(view_file_paths):
     return views
 
 
+def get_function_views(view_file_paths):
+    """
+    Given a list of files with their paths, return a list of all the function-based views in those files.
+    A function-based view is a function defined in the module whose first parameter is named 'request'.
+    :param {list} view_file_paths: A list of view files including their paths relative to the project root.
+    :return: A list which contains all the view functions which reside in the files.
+    """
+    views = []
+    for path in view_file_paths:
+        mod = importlib.import_module(path.replace("/", "."))
+        for _, function in inspect.getmembers(mod, inspect.isfunction):
+            if function.__module__ != mod.__name__:
+                continue
+            # Decorated views, e.g. with login_required, still take the request first.
+            parameters = list(inspect.signature(inspect.unwrap(function)).parameters)
+            if parameters and parameters[0] == "request":
+                views.append(function)
+    return views
+
+
+def is_unrouted_function_view(view, routed_view_paths):
+    """
+    A function-based view is unrouted if it is not decorated with used_view and no URL pattern calls it.
+    :param routed_view_paths: The dotted paths of the unwrapped callbacks of all URL patterns.
+    """
+    if hasattr(view, "is_used"):
+        return not view.is_used
+    return get_view_path(inspect.unwrap(view)) not in routed_view_paths
+
+
+def is_unused_view(view, routed_view_paths):
+    """
+    A view is unused if it is not decorated with used_view, not called by a url and not subclassed.
+    A view decorated with is_used == False is always unused.
+    :param routed_view_paths: The dotted paths of the unwrapped callbacks of all URL patterns.
+        The callback of as_view() is named 'view', so views are matched by their class instead.
+    """
+    if hasattr(view, "is_used"):
+        return not view.is_used
+    # Pulling view.__subclasses__() out of the other loop made it find all classes which subclassed view...
+    #   probably something to do with namespacing.
+    return get_view_path(view) not in routed_view_paths and not view.__subclasses__()
+
+
 def get_url_view_names():
     """
     Returns all the names of all the views called by the URLS.
@@ -0,0 +1,46 @@
+import os
+import subprocess
+from typing import List, Optional
+
+
+def run_git(*args: str, cwd: Optional[str] = None) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+
+
+def resolve_rev(rev: str, cwd: Optional[str] = None) -> str:
+    return run_git("rev-parse", "--verify", f"{rev}^{{commit}}", cwd=cwd).strip()
+
+
+def get_repo_root(cwd: Optional[str] = None) -> str:
+    return run_git("rev-parse", "--show-toplevel", cwd=cwd).strip()
+
+
+def get_changed_files(rev: str, cwd: Optional[str] = None) -> List[str]:
+    """
+    Returns the absolute paths of the files changed since rev in the working tree,
+    including files that are not tracked yet.
+    Raises subprocess.CalledProcessError if git fails, e.g. when rev does not exist.
+    """
+    root = get_repo_root(cwd)
+    changed = run_git("diff", "--name-only", rev, "--", cwd=root).splitlines()
+    untracked = run_git("ls-files", "--others", "--exclude-standard", cwd=root).splitlines()
+    return [os.path.normpath(os.path.join(root, path)) for path in changed + untracked if path]
+
+
+def read_file_at_rev(rev: str, file_path: str, cwd: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the content file_path had at rev, or None if it did not exist at rev.
+    """
+    root = get_repo_root(cwd)
+    relative_path = os.path.relpath(os.path.realpath(file_path), root).replace(os.sep, "/")
+    try:
+        return run_git("show", f"{rev}:{relative_path}", cwd=root)
+    except subprocess.CalledProcessError:
+        return None
@@ -0,0 +1,140 @@
+"""
+Caches what the searches learn from the app registry and the URL tree between runs.
+
+Both are keyed by a fingerprint of the resolved settings they depend on, wherever those are set.
+The URL tree is also checked against the modification times of the urlconf files it was read from,
+so a repeat run only imports the urlconfs after routing has changed.
+"""
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from django.apps import apps
+from django.apps.config import AppConfig
+from django.conf import settings
+
+from .cache import fingerprint_files, read_cache, write_cache
+from .find_templates import get_project_app_configs, get_template_dirs
+from .find_urls import UrlPatternInfo
+from .projects import fingerprint_settings
+
+LAYOUT_CACHE_NAME = "layout"
+ROUTING_CACHE_NAME = "routing"
+
+
+@dataclass
+class ProjectLayout:
+    # The path of each user-created app, by label.
+    app_paths: Dict[str, str]
+    # [directory, app label or None, backend] of every template directory, in search order.
+    template_dirs: List[List[Optional[str]]]
+
+    def is_installed(self) -> bool:
+        """
+        Whether every app the layout refers to is in the app registry.
+        """
+        installed_labels = {config.label for config in apps.get_app_configs()}
+        return set(self.app_paths) <= installed_labels and all(
+            label in installed_labels for _, label, _ in self.template_dirs if label
+        )
+
+    def get_app_configs(self) -> List[AppConfig]:
+        return [apps.get_app_config(label) for label in self.app_paths]
+
+    def get_template_dirs(self) -> List[Tuple[str, Optional[AppConfig], str]]:
+        return [
+            (directory, apps.get_app_config(label) if label else None, backend)
+            for directory, label, backend in self.template_dirs
+        ]
+
+
+@dataclass
+class Routing:
+    url_patterns: List[UrlPatternInfo]
+    urlconf_files: List[str]
+
+    @property
+    def routed_view_paths(self) -> Set[str]:
+        """
+        The dotted paths of the views behind all URL patterns.
+        """
+        return {p.view_path for p in self.url_patterns}
+
+
+def get_settings_fingerprint() -> Optional[str]:
+    """
+    Returns None when the settings do not come from a module, in which case nothing is cached.
+    """
+    settings_module = getattr(settings, "SETTINGS_MODULE", None) or os.environ.get(
+        "DJANGO_SETTINGS_MODULE"
+    )
+    if not settings_module:
+        return None
+    return fingerprint_settings(settings)
+
+
+def build_project_layout() -> ProjectLayout:
+    app_configs = get_project_app_configs()
+    return ProjectLayout(
+        app_paths={config.label: str(config.path) for config in app_configs},
+        template_dirs=[
+            [directory, app_config.label if app_config else None, backend]
+            for directory, app_config, backend in get_template_dirs(app_configs=app_configs)
+        ],
+    )
+
+
+def load_project_layout(use_cache: bool = True) -> ProjectLayout:
+    """
+    Returns the project apps and template directories, from the cache while the settings are unchanged.
+    """
+    key = get_settings_fingerprint() if use_cache else None
+    if key:
+        data = read_cache(LAYOUT_CACHE_NAME, key)
+        if data is not None:
+            layout = ProjectLayout(**data)
+            if layout.is_installed():
+                return layout
+
+    layout = build_project_layout()
+    if key:
+        write_cache(LAYOUT_CACHE_NAME, key, asdict(layout))
+    return layout
+
+
+def build_routing() -> Routing:
+    from .find_urls import walk_root_urlconf
+
+    url_patterns, urlconf_files = walk_root_urlconf()
+    return Routing(url_patterns=url_patterns, urlconf_files=urlconf_files)
+
+
+def load_routing(use_cache: bool = True) -> Routing:
+    """
+    Returns the URL patterns, from the cache while neither the settings nor any urlconf has changed.
+    Cached patterns carry the dotted paths of their views, but not the views themselves.
+    """
+    key = get_settings_fingerprint() if use_cache else None
+    if key:
+        data = read_cache(ROUTING_CACHE_NAME, key)
+        # The urlconf files are only known once they are imported, so they are checked separately.
+        if data is not None and fingerprint_files(data["urlconf_files"]) == data["urlconf_fingerprint"]:
+            return Routing(
+                url_patterns=[UrlPatternInfo(*p) for p in data["url_patterns"]],
+                urlconf_files=data["urlconf_files"],
+            )
+
+    routing = build_routing()
+    if key:
+        write_cache(
+            ROUTING_CACHE_NAME,
+            key,
+            {
+                "url_patterns": [
+                    [p.name, p.pattern, p.view_path, p.is_project] for p in routing.url_patterns
+                ],
+                "urlconf_files": routing.urlconf_files,
+                "urlconf_fingerprint": fingerprint_files(routing.urlconf_files),
+            },
+        )
+    return routing
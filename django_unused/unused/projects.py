@@ -0,0 +1,131 @@
+import importlib
+import importlib.util
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from .cache import fingerprint_values, read_cache, write_cache
+
+
+@dataclass
+class AppInfo:
+    """
+    The parts of an AppConfig the template search needs, read without populating the app registry.
+    """
+    name: str
+    label: str
+    path: str
+
+
+@dataclass
+class ProjectSnapshot:
+    settings_module: str
+    base_dir: str
+    template_settings: List[Dict[str, Any]]
+    app_configs: List[AppInfo]
+
+
+def find_app_path(app_entry: str) -> Optional[AppInfo]:
+    """
+    Finds the package of an INSTALLED_APPS entry, which is either a module or an AppConfig path.
+    Only the package is located; neither it nor its models are imported.
+    """
+    candidates = [app_entry]
+    module_name, _, _ = app_entry.rpartition(".")
+    if module_name.endswith(".apps"):
+        candidates.append(module_name[: -len(".apps")])
+    elif module_name:
+        candidates.append(module_name)
+
+    for name in candidates:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec and spec.submodule_search_locations:
+            return AppInfo(
+                name=name,
+                label=name.rpartition(".")[2],
+                path=list(spec.submodule_search_locations)[0],
+            )
+    return None
+
+
+def snapshot_template_settings(template_settings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Keeps the parts of a TEMPLATES setting that decide where templates are found, as plain JSON data.
+    """
+
+    def plain(value):
+        if isinstance(value, (list, tuple)):
+            return [plain(v) for v in value]
+        return str(value)
+
+    snapshot = []
+    for template_backend in template_settings:
+        backend_snapshot = {
+            "BACKEND": str(template_backend.get("BACKEND", "")),
+            "DIRS": [str(d) for d in template_backend.get("DIRS", [])],
+            "APP_DIRS": bool(template_backend.get("APP_DIRS", False)),
+        }
+        loaders = template_backend.get("OPTIONS", {}).get("loaders")
+        if loaders is not None:
+            backend_snapshot["OPTIONS"] = {"loaders": plain(loaders)}
+        snapshot.append(backend_snapshot)
+    return snapshot
+
+
+def load_project_snapshot(settings_module: str) -> ProjectSnapshot:
+    """
+    Reads what the template search needs from a settings module without calling django.setup(),
+    so that several projects can be analysed in one process.
+    """
+    settings = importlib.import_module(settings_module)
+    base_dir = str(getattr(settings, "BASE_DIR", os.getcwd()))
+
+    app_configs = []
+    for app_entry in getattr(settings, "INSTALLED_APPS", []):
+        app_info = find_app_path(app_entry)
+        # Only user-created apps, i.e. the apps inside BASE_DIR, are searched.
+        if app_info and app_info.path.find(base_dir) > -1:
+            app_configs.append(app_info)
+
+    return ProjectSnapshot(
+        settings_module=settings_module,
+        base_dir=base_dir,
+        template_settings=snapshot_template_settings(getattr(settings, "TEMPLATES", [])),
+        app_configs=app_configs,
+    )
+
+
+def fingerprint_settings(settings: Any) -> str:
+    """
+    Hashes the resolved settings the searches depend on, so that a change is seen
+    whether it comes from the settings module, a module it imports or an environment variable.
+    :param settings: A settings module, or django.conf.settings.
+    """
+    return fingerprint_values(
+        [
+            str(getattr(settings, "BASE_DIR", os.getcwd())),
+            [str(app_entry) for app_entry in getattr(settings, "INSTALLED_APPS", [])],
+            snapshot_template_settings(getattr(settings, "TEMPLATES", [])),
+            str(getattr(settings, "ROOT_URLCONF", "")),
+        ]
+    )
+
+
+def load_cached_project_snapshot(settings_module: str) -> ProjectSnapshot:
+    """
+    Like load_project_snapshot, but reuses the snapshot stored on disk
+    as long as the settings it was read from resolve to the same values.
+    """
+    cache_name = f"snapshot-{settings_module}"
+    key = fingerprint_settings(importlib.import_module(settings_module))
+    data = read_cache(cache_name, key)
+    if data is not None:
+        data["app_configs"] = [AppInfo(**a) for a in data["app_configs"]]
+        return ProjectSnapshot(**data)
+
+    snapshot = load_project_snapshot(settings_module)
+    write_cache(cache_name, key, asdict(snapshot))
+    return snapshot
@@ -0,0 +1,61 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .scan import RawReference
+
+REFERENCE_INDEX_VERSION = 2
+DEFAULT_BASELINE_PATH = ".django-unused-baseline.json"
+
+
+@dataclass
+class ReferenceIndex:
+    files: Dict[str, List[RawReference]]
+    # The commit the files were scanned at, if known.
+    rev: Optional[str] = None
+
+
+def save_reference_index(
+    path: str,
+    file_references: Union[
+        Dict[str, List[RawReference]], Iterable[Tuple[str, List[RawReference]]]
+    ],
+    rev: Optional[str] = None,
+):
+    """
+    Stores the raw references of each scanned file, so that later runs only rescan changed files.
+    The files are written one at a time, so file_references may also be a generator of
+    (file path, raw references) pairs that never holds every file in memory.
+    :param rev: The commit the files were scanned at, if known.
+    """
+    if isinstance(file_references, dict):
+        file_references = file_references.items()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f'{{"version": {REFERENCE_INDEX_VERSION}, "rev": {json.dumps(rev)}, "files": {{')
+        for i, (file_path, references) in enumerate(file_references):
+            records = [[r.line_number, r.line, r.token, r.reference_type] for r in references]
+            f.write(f"{', ' if i else ''}{json.dumps(file_path)}: {json.dumps(records)}")
+        f.write("}}")
+    os.replace(tmp_path, path)
+
+
+def load_reference_index(path: str) -> Optional[ReferenceIndex]:
+    """
+    Returns the stored reference index, or None if there is no usable index at path.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != REFERENCE_INDEX_VERSION:
+        return None
+    return ReferenceIndex(
+        files={
+            file_path: [RawReference(*r) for r in references]
+            for file_path, references in data["files"].items()
+        },
+        rev=data.get("rev"),
+    )
@@ -0,0 +1,210 @@
+"""
+Removal of unused templates, checked against a stored reference index and undoable.
+
+The candidates come from a snapshot of an earlier run. Before anything is removed, each candidate is
+checked again by resolving the references stored in the baseline, so no file is read a second time.
+All files are then moved into one batch directory in a single step: if any move fails, the files
+already moved are put back. A trash directory on another filesystem is filled by copying.
+A manifest in the batch directory records every move, so that the whole batch can be restored.
+"""
+import errno
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .find_templates import TemplateInfo
+from .reference_index import ReferenceIndex
+from .search_templates import resolve_references
+
+DEFAULT_TRASH_DIR = ".django-unused-trash"
+MANIFEST_NAME = "manifest.json"
+REMOVAL_MANIFEST_VERSION = 1
+
+
+@dataclass
+class RemovalPlan:
+    # The candidates that are still unused in the reference index.
+    templates: List[TemplateInfo]
+    # The candidates the reference index has references to.
+    still_used: List[TemplateInfo] = field(default_factory=list)
+    # The candidate files that are not among the searched templates (any more).
+    missing: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RemovalManifest:
+    path: str
+    # [original path, path in the batch directory] of each removed file.
+    files: List[List[str]]
+    # The directories emptied by the removal, deepest first.
+    directories: List[str]
+
+
+def get_template_root(template: TemplateInfo) -> str:
+    """
+    Returns the template directory the template was found in.
+    """
+    depth = len(template.template_path.replace("\\", "/").split("/"))
+    root = template.file_path
+    for _ in range(depth):
+        root = os.path.dirname(root)
+    return root
+
+
+def find_stale_files(file_paths: Iterable[str], baseline_path: str, baseline: ReferenceIndex) -> List[str]:
+    """
+    Returns the files the baseline does not describe: files it does not have,
+    and files modified after it was saved. Only the modification times are read.
+    """
+    saved_at = os.path.getmtime(baseline_path)
+    return [
+        f
+        for f in file_paths
+        if f not in baseline.files or os.path.getmtime(f) > saved_at
+    ]
+
+
+def plan_template_removal(
+    candidates: Iterable[str],
+    templates: List[TemplateInfo],
+    index: Dict[str, TemplateInfo],
+    baseline: ReferenceIndex,
+) -> RemovalPlan:
+    """
+    Resolves the references stored in the baseline against the current templates,
+    and keeps the candidates that nothing references.
+    :param candidates: The file paths of the templates to remove.
+    """
+    result = resolve_references(templates, index, baseline.files)
+    unused_files = {t.file_path for t in result.unused_templates}
+    templates_by_file = {t.file_path: t for t in templates}
+
+    plan = RemovalPlan(templates=[])
+    for file_path in sorted(set(candidates)):
+        template = templates_by_file.get(file_path)
+        if template is None:
+            plan.missing.append(file_path)
+        elif file_path in unused_files:
+            plan.templates.append(template)
+        else:
+            plan.still_used.append(template)
+    return plan
+
+
+def new_batch_dir(trash_dir: str) -> str:
+    batch_dir = os.path.join(trash_dir, time.strftime("%Y%m%d-%H%M%S"))
+    suffix = 1
+    while os.path.exists(batch_dir):
+        suffix += 1
+        batch_dir = os.path.join(trash_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{suffix}")
+    os.makedirs(batch_dir)
+    return batch_dir
+
+
+def write_manifest(manifest: RemovalManifest):
+    data = {
+        "version": REMOVAL_MANIFEST_VERSION,
+        "files": manifest.files,
+        "directories": manifest.directories,
+    }
+    tmp_path = f"{manifest.path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, manifest.path)
+
+
+def load_manifest(path: str) -> RemovalManifest:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != REMOVAL_MANIFEST_VERSION:
+        raise ValueError(f"{path} is not a removal manifest.")
+    return RemovalManifest(path=path, files=data["files"], directories=data["directories"])
+
+
+def move_file(source: str, target: str):
+    """
+    Renames source to target, or copies it over and removes it when they are on different filesystems.
+    """
+    try:
+        os.replace(source, target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source, target)
+
+
+def remove_empty_directories(file_paths: Iterable[str], roots: Set[str]) -> List[str]:
+    """
+    Removes the directories below roots that are empty once file_paths are gone. The roots stay.
+    """
+    removed: List[str] = []
+    directories = {os.path.dirname(f) for f in file_paths}
+    # The deepest directories go first, so that their parents can be emptied in turn.
+    for directory in sorted(directories, key=lambda d: d.count(os.sep), reverse=True):
+        while directory not in roots and any(directory.startswith(r + os.sep) for r in roots):
+            if directory in removed:
+                break
+            try:
+                os.rmdir(directory)
+            except OSError:
+                # Not empty.
+                break
+            removed.append(directory)
+            directory = os.path.dirname(directory)
+    return removed
+
+
+def remove_templates(templates: List[TemplateInfo], trash_dir: str = DEFAULT_TRASH_DIR) -> RemovalManifest:
+    """
+    Moves the templates into a new batch directory under trash_dir, all or none of them,
+    then removes the template subdirectories that were emptied.
+    The manifest is written before the first move, so an interrupted batch can still be restored.
+    """
+    batch_dir = new_batch_dir(trash_dir)
+    moves: List[Tuple[str, str]] = [
+        (t.file_path, os.path.join(batch_dir, str(i), os.path.basename(t.file_path)))
+        for i, t in enumerate(templates)
+    ]
+    manifest = RemovalManifest(
+        path=os.path.join(batch_dir, MANIFEST_NAME),
+        files=[[os.path.abspath(source), os.path.abspath(target)] for source, target in moves],
+        directories=[],
+    )
+    write_manifest(manifest)
+
+    moved: List[Tuple[str, str]] = []
+    try:
+        for source, target in moves:
+            os.makedirs(os.path.dirname(target))
+            move_file(source, target)
+            moved.append((source, target))
+    except OSError:
+        for source, target in reversed(moved):
+            move_file(target, source)
+        shutil.rmtree(batch_dir)
+        raise
+
+    roots = {get_template_root(t) for t in templates}
+    manifest.directories = remove_empty_directories([t.file_path for t in templates], roots)
+    write_manifest(manifest)
+    return manifest
+
+
+def restore_templates(manifest_path: str) -> RemovalManifest:
+    """
+    Puts the files of a removal batch back, recreating the directories it removed.
+    Raises FileExistsError, before moving anything, if a file has been recreated since.
+    """
+    manifest = load_manifest(manifest_path)
+    # Files still in place were never moved, e.g. when the batch was interrupted.
+    pending = [(original, trashed) for original, trashed in manifest.files if os.path.exists(trashed)]
+    for original, _ in pending:
+        if os.path.exists(original):
+            raise FileExistsError(f"{original} already exists.")
+    for original, trashed in pending:
+        os.makedirs(os.path.dirname(original), exist_ok=True)
+        move_file(trashed, original)
+    return manifest
@@ -0,0 +1,121 @@
+import posixpath
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .extractors import (
+    PYTHON_FILE_TYPE,
+    TemplateTags,
+    determine_reference_type,
+    extract_template_tags,
+    get_reference_extractors,
+)
+from .prefetch import prefetch_files, read_file
+
+# Path-like tokens, which also covers namespaced URL names such as "blog:detail".
+TEMPLATE_NAME_RE = re.compile(r"[\w\-./:]+")
+
+# The reference type of the raw references that record a {% block %} definition instead of a reference.
+BLOCK_REFERENCE_TYPE = "block"
+
+
+@dataclass
+class RawReference:
+    """
+    A path-like token found in a file, before it is resolved against a template index.
+    For reference_type "block", token is the name of a block the file defines.
+    """
+    line_number: int
+    line: str
+    token: str
+    reference_type: str
+
+
+def is_candidate_token(token: str, known_names: Set[str]) -> bool:
+    return token.startswith(("./", "../")) or posixpath.basename(token) in known_names
+
+
+def scan_source(
+    source: str, known_names: Set[str], backend: Optional[str] = None
+) -> List[RawReference]:
+    """
+    Finds every token in source that could name one of the templates or other known names.
+    The registered reference extractors for the file type add the names they find.
+    :param known_names: The basenames of all templates that can be referenced, plus any other
+        names to look for, e.g. URL names.
+    :param backend: The template backend of the file, or None for Python files.
+    """
+    # The engine's own lexer types the references; the source is still read only once.
+    tags = extract_template_tags(source, backend) if backend else TemplateTags()
+    # Extractors whose prefilter tokens are nowhere in the file are skipped for all of its lines.
+    extractors = [
+        e
+        for e in get_reference_extractors(backend or PYTHON_FILE_TYPE)
+        if any(t in source for t in e.prefilter_tokens)
+    ]
+    # Split on newlines only, so that line numbers agree with the template lexers.
+    lines = source.split("\n")
+    references: List[RawReference] = [
+        RawReference(line_number, lines[line_number - 1].strip(), name, BLOCK_REFERENCE_TYPE)
+        for line_number, name in tags.blocks
+    ]
+    for line_number, line in enumerate(lines, 1):
+        tokens = {
+            token.rstrip(".:")
+            for token in TEMPLATE_NAME_RE.findall(line)
+        }
+        tokens = sorted(t for t in tokens if is_candidate_token(t, known_names))
+        extracted: Dict[str, str] = {}
+        for extractor in extractors:
+            if any(t in line for t in extractor.prefilter_tokens):
+                for name in extractor.extract(line):
+                    if name not in tokens and is_candidate_token(name, known_names):
+                        extracted.setdefault(name, extractor.reference_type)
+        if not tokens and not extracted:
+            continue
+        reference_type = tags.reference_types.get(
+            line_number, determine_reference_type(line)
+        )
+        line = line.strip()
+        references.extend(
+            RawReference(line_number, line, token, reference_type) for token in tokens
+        )
+        references.extend(
+            RawReference(line_number, line, name, extracted[name]) for name in sorted(extracted)
+        )
+    return references
+
+
+def scan_file(
+    file_path: str, known_names: Set[str], backend: Optional[str] = None
+) -> List[RawReference]:
+    return scan_source(read_file(file_path), known_names, backend)
+
+
+def iter_scanned_files(
+    file_paths: Iterable[str],
+    known_names: Set[str],
+    backends: Dict[str, str],
+    max_in_flight: int = 1,
+) -> Iterator[Tuple[str, List[RawReference]]]:
+    """
+    Scans each file once, in order, yielding its path and raw references.
+    :param max_in_flight: How many files are read ahead on a thread pool while earlier ones are scanned.
+    """
+    for file_path, source in prefetch_files(file_paths, max_in_flight):
+        yield file_path, scan_source(source, known_names, backends.get(file_path))
+
+
+def scan_files(
+    file_paths: Iterable[str],
+    known_names: Set[str],
+    backends: Dict[str, str],
+    max_in_flight: int = 1,
+) -> Dict[str, List[RawReference]]:
+    """
+    Scans each file once.
+    :param backends: The template backend of each template file; other files are scanned as Python.
+    :param max_in_flight: How many files are read ahead on a thread pool while earlier ones are scanned.
+    :return: A dict of file path to the raw references found in it.
+    """
+    return dict(iter_scanned_files(file_paths, known_names, backends, max_in_flight))
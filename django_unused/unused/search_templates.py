@@ -0,0 +1,252 @@
+import posixpath
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from django.apps.config import AppConfig
+
+from .extractors import load_reference_extractors
+from .find_templates import (
+    TemplateInfo,
+    build_basename_index,
+    build_template_index,
+    find_py_files,
+    find_shadowed_templates,
+    iter_py_files,
+    resolve_template_name,
+)
+from .scan import BLOCK_REFERENCE_TYPE, RawReference
+
+
+@dataclass
+class TemplateFilterOptions:
+    excluded_apps: Optional[Iterable[str]] = None
+    excluded_template_dirs: Optional[Iterable[str]] = None
+
+
+@dataclass
+class Reference:
+    # The referencing template, or None when the reference is in a Python file.
+    template_info: Optional[TemplateInfo]
+    line_number: int
+    line: str
+    reference_type: str
+    file_path: str = ""
+    # How many templates share the referenced basename; 1 means the match is exact.
+    ambiguity: int = 1
+
+    @property
+    def source_path(self) -> str:
+        return self.template_info.template_path if self.template_info else self.file_path
+
+
+@dataclass
+class UsedTemplateInfo:
+    template_info: TemplateInfo
+    references: List[Reference]
+
+
+@dataclass
+class TemplateSearchResult:
+    unused_templates: List[TemplateInfo]
+    used_templates: List[UsedTemplateInfo]
+    shadowed_templates: List[TemplateInfo] = field(default_factory=list)
+    # The names of the blocks each searched template defines, by file path.
+    blocks: Dict[str, List[str]] = field(default_factory=dict)
+
+
+def exclude_app_templates(
+    templates: List[TemplateInfo], excluded_apps: Iterable[str]
+) -> List[TemplateInfo]:
+    excluded_apps_set = set(excluded_apps)
+    return [
+        t
+        for t in templates
+        if not (t.app_config and t.app_config.name in excluded_apps_set)
+    ]
+
+
+def exclude_template_dirs(
+    templates: List[TemplateInfo], excluded_template_dirs: Iterable[str]
+) -> List[TemplateInfo]:
+    excluded_dirs_set = set(excluded_template_dirs)
+    return [
+        t
+        for t in templates
+        if not any(t.template_path.startswith(d) for d in excluded_dirs_set)
+    ]
+
+
+def exclude_templates(
+    templates: List[TemplateInfo], filter_options: Optional[TemplateFilterOptions]
+) -> List[TemplateInfo]:
+    if filter_options and filter_options.excluded_apps:
+        templates = exclude_app_templates(templates, filter_options.excluded_apps)
+    if filter_options and filter_options.excluded_template_dirs:
+        templates = exclude_template_dirs(templates, filter_options.excluded_template_dirs)
+    return templates
+
+
+@dataclass
+class TemplateSearchSetup:
+    """
+    What a template search works on: the templates to report, and the files to scan for references.
+    """
+    templates: List[TemplateInfo]
+    # Built from the unfiltered templates, so that excluded files still shadow others.
+    index: Dict[str, TemplateInfo]
+    # A list, or a generator that can only be iterated once when the files are found lazily.
+    py_files: Iterable[str]
+    basenames: Set[str]
+    # The backend of each template file; other files are scanned as Python.
+    backends: Dict[str, str]
+
+    @property
+    def file_paths(self) -> Iterable[str]:
+        return chain(self.py_files, [t.file_path for t in self.templates])
+
+
+def setup_template_search(
+    templates: List[TemplateInfo],
+    filter_options: Optional[TemplateFilterOptions] = None,
+    app_configs: Optional[List["AppConfig"]] = None,
+    exclude: Callable[
+        [List[TemplateInfo], Optional[TemplateFilterOptions]], List[TemplateInfo]
+    ] = exclude_templates,
+    lazy_py_files: bool = False,
+) -> TemplateSearchSetup:
+    """
+    Prepares a template search from all templates of a project, in loader order,
+    and registers the reference extractors of the UNUSED_REFERENCE_EXTRACTORS setting.
+    :param app_configs: The apps whose Python files are searched, by default the user-created apps.
+    :param exclude: Filters the templates, e.g. to also report how many were excluded.
+    :param lazy_py_files: Find the Python files while they are being scanned.
+    """
+    load_reference_extractors()
+    index = build_template_index(templates)
+    templates = exclude(templates, filter_options)
+    if lazy_py_files:
+        py_files: Iterable[str] = (f for f, _ in iter_py_files(app_configs=app_configs))
+    else:
+        py_files, _ = find_py_files(app_configs=app_configs)
+    return TemplateSearchSetup(
+        templates=templates,
+        index=index,
+        py_files=py_files,
+        basenames={posixpath.basename(t.template_path) for t in templates},
+        backends={t.file_path: t.backend for t in templates},
+    )
+
+
+class ReferenceResolver:
+    """
+    Resolves the raw references found by the scan against one project's template index,
+    one file at a time, so that results can be reported while the scan is running.
+    """
+
+    def __init__(self, templates: List[TemplateInfo], index: Dict[str, TemplateInfo]):
+        self.templates = templates
+        self.index = index
+        self.templates_by_file = {t.file_path: t for t in templates}
+        # Only the winning copy of each name can be referenced; shadowed copies are never rendered.
+        self.searched_index = {
+            name: t for name, t in index.items() if t.file_path in self.templates_by_file
+        }
+        self.basename_index = build_basename_index(self.searched_index)
+        self.used_templates_by_file: Dict[str, UsedTemplateInfo] = {}
+        self.blocks: Dict[str, List[str]] = {}
+
+    def add_file(
+        self, file_path: str, raw_references: List[RawReference]
+    ) -> List[TemplateInfo]:
+        """
+        Records the references of one file.
+        :return: The templates that were not referenced by any earlier file.
+        """
+        referencing_template = self.templates_by_file.get(file_path)
+        referencing_path = (
+            referencing_template.template_path if referencing_template else None
+        )
+        newly_used: List[TemplateInfo] = []
+        referenced_lines = set()
+        for raw_reference in raw_references:
+            if raw_reference.reference_type == BLOCK_REFERENCE_TYPE:
+                if referencing_template:
+                    self.record_block(file_path, raw_reference.token)
+                continue
+            match = resolve_template_name(
+                raw_reference.token,
+                self.searched_index,
+                self.basename_index,
+                referencing_path,
+            )
+            if not match:
+                continue
+            template_path, ambiguity = match
+            template = self.searched_index[template_path]
+            if (
+                template is referencing_template
+                or (raw_reference.line_number, template_path) in referenced_lines
+            ):
+                continue
+            referenced_lines.add((raw_reference.line_number, template_path))
+
+            reference = Reference(
+                template_info=referencing_template,
+                line_number=raw_reference.line_number,
+                line=raw_reference.line,
+                reference_type=raw_reference.reference_type,
+                file_path=file_path,
+                ambiguity=ambiguity,
+            )
+            if self.record_reference(template, reference):
+                newly_used.append(template)
+        return newly_used
+
+    def record_block(self, file_path: str, name: str):
+        """
+        Keeps the name of a block the template at file_path defines.
+        """
+        self.blocks.setdefault(file_path, []).append(name)
+
+    def record_reference(self, template: TemplateInfo, reference: Reference) -> bool:
+        """
+        Stores a resolved reference.
+        :return: Whether it is the first reference to the template.
+        """
+        used_template_info = self.used_templates_by_file.get(template.file_path)
+        if used_template_info:
+            used_template_info.references.append(reference)
+            return False
+        self.used_templates_by_file[template.file_path] = UsedTemplateInfo(
+            template_info=template, references=[reference]
+        )
+        return True
+
+    def result(self) -> TemplateSearchResult:
+        used_templates = list(self.used_templates_by_file.values())
+        unused_templates = [
+            t for t in self.templates if t.file_path not in self.used_templates_by_file
+        ]
+        return TemplateSearchResult(
+            unused_templates=unused_templates,
+            used_templates=used_templates,
+            shadowed_templates=find_shadowed_templates(self.templates, self.index),
+            blocks=self.blocks,
+        )
+
+
+def resolve_references(
+    templates: List[TemplateInfo],
+    index: Dict[str, TemplateInfo],
+    file_references: Dict[str, List[RawReference]],
+) -> TemplateSearchResult:
+    """
+    Resolves the raw references found by the scan against one project's template index.
+    :param file_references: The raw references of each file that belongs to the project.
+    """
+    resolver = ReferenceResolver(templates, index)
+    for file_path, raw_references in file_references.items():
+        resolver.add_file(file_path, raw_references)
+    return resolver.result()
@@ -0,0 +1,212 @@
+"""
+Bounded-memory aggregation of template references.
+
+The in-memory search keeps every reference of every used template until the end. On very large
+trees that list is what fills the memory, so this resolver only keeps a fixed-size reference counter
+per template, which is all the unused answer needs, and writes the reference details to sorted runs
+on disk. The runs are merged back when the details are read, one template at a time.
+The names of the blocks each template defines are spilled the same way.
+"""
+import heapq
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .find_templates import TemplateInfo, find_shadowed_templates
+from .search_templates import (
+    Reference,
+    ReferenceResolver,
+    TemplateSearchResult,
+    UsedTemplateInfo,
+)
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# At most this many runs are merged at once, which bounds the number of open files.
+MAX_MERGE_WIDTH = 64
+
+# What a buffered record costs besides its key and line: the tuple holding them and the list slot.
+RECORD_OVERHEAD = sys.getsizeof(("", "")) + struct.calcsize("P")
+
+# The share of the memory budget that buffers block names, the rest buffers reference details.
+BLOCKS_BUDGET_SHARE = 8
+
+
+class ReferenceSpill:
+    """
+    Buffers (key, record) pairs up to memory_budget bytes, then writes them to disk as a sorted run.
+    Records with the same key come back together, in the order they were added.
+    """
+
+    def __init__(self, memory_budget: int, directory: Optional[str] = None):
+        if memory_budget <= 0:
+            raise ValueError("The memory budget must be positive.")
+        self.memory_budget = memory_budget
+        self.directory = tempfile.TemporaryDirectory(prefix="django-unused-", dir=directory)
+        self.buffer: List[Tuple[str, str]] = []
+        self.buffer_size = 0
+        self.run_paths: List[str] = []
+        self.run_count = 0
+
+    def add(self, key: str, record: list):
+        line = json.dumps([key] + record)
+        self.buffer.append((key, line))
+        self.buffer_size += sys.getsizeof(key) + sys.getsizeof(line) + RECORD_OVERHEAD
+        if self.buffer_size >= self.memory_budget:
+            self.flush()
+
+    def new_run_path(self) -> str:
+        self.run_count += 1
+        return os.path.join(self.directory.name, f"run-{self.run_count}.jsonl")
+
+    def flush(self):
+        if not self.buffer:
+            return
+        # The sort is stable, so records with the same key keep the order they were added in.
+        self.buffer.sort(key=itemgetter(0))
+        run_path = self.new_run_path()
+        with open(run_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{line}\n" for _, line in self.buffer)
+        self.buffer = []
+        self.buffer_size = 0
+        self.run_paths.append(run_path)
+        if len(self.run_paths) > MAX_MERGE_WIDTH:
+            self.merge_runs()
+
+    def iter_merged(self, run_paths: List[str]) -> Iterator[list]:
+        files = [open(p, encoding="utf-8") for p in run_paths]
+        try:
+            # heapq.merge takes equal keys from earlier runs first, which keeps the order stable.
+            yield from heapq.merge(*(map(json.loads, f) for f in files), key=itemgetter(0))
+        finally:
+            for f in files:
+                f.close()
+
+    def merge_runs(self):
+        run_path = self.new_run_path()
+        with open(run_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{json.dumps(r)}\n" for r in self.iter_merged(self.run_paths))
+        for old_run_path in self.run_paths:
+            os.remove(old_run_path)
+        self.run_paths = [run_path]
+
+    def iter_groups(self) -> Iterator[Tuple[str, List[list]]]:
+        """
+        Yields each key with its records, in key order. Only one key's records are in memory at a time.
+        """
+        self.flush()
+        for key, records in groupby(self.iter_merged(self.run_paths), key=itemgetter(0)):
+            yield key, [r[1:] for r in records]
+
+
+class SpilledUsedTemplates:
+    """
+    The used templates of a spilling search, read back from disk each time they are iterated.
+    Templates come grouped by app and in search order within an app.
+    """
+
+    def __init__(self, resolver: "SpillingReferenceResolver"):
+        self.resolver = resolver
+
+    def __len__(self) -> int:
+        return sum(1 for count in self.resolver.reference_counts if count)
+
+    def __iter__(self) -> Iterator[UsedTemplateInfo]:
+        templates = self.resolver.templates
+        templates_by_file = self.resolver.templates_by_file
+        for key, records in self.resolver.spill.iter_groups():
+            references = [
+                Reference(
+                    template_info=templates_by_file.get(file_path),
+                    line_number=line_number,
+                    line=line,
+                    reference_type=reference_type,
+                    file_path=file_path,
+                    ambiguity=ambiguity,
+                )
+                for file_path, line_number, line, reference_type, ambiguity in records
+            ]
+            position = int(key.rpartition(":")[2])
+            yield UsedTemplateInfo(template_info=templates[position], references=references)
+
+
+class SpilledBlocks:
+    """
+    The block names of a spilling search by file path, read back from disk on the first lookup.
+    Only the template graph looks them up, so a plain search never loads them.
+    """
+
+    def __init__(self, spill: ReferenceSpill):
+        self.spill = spill
+        self.blocks: Optional[Dict[str, List[str]]] = None
+
+    def get(self, file_path: str, default: Optional[List[str]] = None) -> Optional[List[str]]:
+        if self.blocks is None:
+            self.blocks = {
+                key: [name for name, in records] for key, records in self.spill.iter_groups()
+            }
+        return self.blocks.get(file_path, default)
+
+
+class SpillingReferenceResolver(ReferenceResolver):
+    """
+    A ReferenceResolver whose memory stays flat however many references there are:
+    the unused answer comes from one counter per template, the details from the spill files.
+    """
+
+    def __init__(
+        self,
+        templates: List[TemplateInfo],
+        index: Dict[str, TemplateInfo],
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        spill_dir: Optional[str] = None,
+    ):
+        if memory_budget <= 0:
+            raise ValueError("The memory budget must be positive.")
+        super().__init__(templates, index)
+        blocks_budget = max(memory_budget // BLOCKS_BUDGET_SHARE, 1)
+        self.spill = ReferenceSpill(max(memory_budget - blocks_budget, 1), spill_dir)
+        self.blocks_spill = ReferenceSpill(blocks_budget, spill_dir)
+        self.reference_counts = array("L", bytes(array("L").itemsize * len(templates)))
+        # Sorting the spill by app, then by position, yields each app's used templates together.
+        app_positions: Dict[str, int] = {}
+        self.spill_keys: Dict[str, Tuple[str, int]] = {}
+        for position, template in enumerate(templates):
+            app_name = template.app_config.name if template.app_config else ""
+            app_position = app_positions.setdefault(app_name, len(app_positions))
+            self.spill_keys[template.file_path] = (f"{app_position:08d}:{position:08d}", position)
+
+    def record_block(self, file_path: str, name: str):
+        self.blocks_spill.add(file_path, [name])
+
+    def record_reference(self, template: TemplateInfo, reference: Reference) -> bool:
+        key, position = self.spill_keys[template.file_path]
+        self.reference_counts[position] += 1
+        self.spill.add(
+            key,
+            [
+                reference.file_path,
+                reference.line_number,
+                reference.line,
+                reference.reference_type,
+                reference.ambiguity,
+            ],
+        )
+        return self.reference_counts[position] == 1
+
+    def result(self) -> TemplateSearchResult:
+        unused_templates = [
+            t for t, count in zip(self.templates, self.reference_counts) if not count
+        ]
+        return TemplateSearchResult(
+            unused_templates=unused_templates,
+            used_templates=SpilledUsedTemplates(self),
+            shadowed_templates=find_shadowed_templates(self.templates, self.index),
+            blocks=SpilledBlocks(self.blocks_spill),
+        )
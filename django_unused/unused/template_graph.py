@@ -0,0 +1,112 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+from .find_templates import TemplateInfo
+from .search_templates import TemplateSearchResult
+
+
+@dataclass
+class BlockOverrides:
+    template_info: TemplateInfo
+    # Each block the template defines and the templates extending it, directly or not, that override it.
+    overrides: Dict[str, List[TemplateInfo]]
+
+    @property
+    def unused_blocks(self) -> List[str]:
+        return [name for name, children in self.overrides.items() if not children]
+
+
+@dataclass
+class TemplateGraph:
+    # One entry per template that is extended by at least one other template.
+    block_overrides: List[BlockOverrides]
+    # Templates that are referenced, but only through templates that are unused or dead themselves.
+    dead_templates: List[TemplateInfo]
+
+
+def topological_order(children: Dict[str, Set[str]]) -> List[str]:
+    """
+    Orders the nodes so that each comes before its children. Nodes on a cycle are left out.
+    """
+    parent_counts: Dict[str, int] = {node: 0 for node in children}
+    for node_children in children.values():
+        for child in node_children:
+            parent_counts[child] = parent_counts.get(child, 0) + 1
+
+    queue = deque(sorted(node for node, count in parent_counts.items() if count == 0))
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for child in sorted(children.get(node, ())):
+            parent_counts[child] -= 1
+            if parent_counts[child] == 0:
+                queue.append(child)
+    return order
+
+
+def analyse_template_graph(result: TemplateSearchResult) -> TemplateGraph:
+    """
+    Works out block overrides and dead templates from the references of a search result,
+    without reading any file again.
+    """
+    templates_by_file = {t.file_path: t for t in result.unused_templates}
+    templates_by_file.update(
+        (u.template_info.file_path, u.template_info) for u in result.used_templates
+    )
+
+    # Edges point from the referencing template to the referenced one.
+    references: Dict[str, Set[str]] = {}
+    extended_by: Dict[str, Set[str]] = {}
+    live: Set[str] = set()
+    for used_template in result.used_templates:
+        target = used_template.template_info.file_path
+        for reference in used_template.references:
+            if reference.template_info is None:
+                # Referenced from Python code, e.g. a view's template_name.
+                live.add(target)
+                continue
+            source = reference.template_info.file_path
+            references.setdefault(source, set()).add(target)
+            if reference.reference_type == "extend":
+                extended_by.setdefault(target, set()).add(source)
+
+    queue = deque(live)
+    while queue:
+        for target in references.get(queue.popleft(), ()):
+            if target not in live:
+                live.add(target)
+                queue.append(target)
+    dead_templates = [
+        u.template_info for u in result.used_templates if u.template_info.file_path not in live
+    ]
+
+    # Children come after their parents, so walking the order backwards visits each child first
+    # and every template's overrides are collected from its children's in one pass.
+    descendant_overrides: Dict[str, Dict[str, List[str]]] = {}
+    for file_path in reversed(topological_order(extended_by)):
+        overrides: Dict[str, List[str]] = {}
+        for child in sorted(extended_by.get(file_path, ())):
+            for name in result.blocks.get(child, []):
+                overrides.setdefault(name, []).append(child)
+            for name, children in descendant_overrides.get(child, {}).items():
+                overrides.setdefault(name, []).extend(children)
+        descendant_overrides[file_path] = overrides
+
+    block_overrides = []
+    for file_path in extended_by:
+        if file_path not in templates_by_file:
+            continue
+        overrides = descendant_overrides.get(file_path, {})
+        block_overrides.append(
+            BlockOverrides(
+                template_info=templates_by_file[file_path],
+                overrides={
+                    name: [templates_by_file[c] for c in dict.fromkeys(overrides.get(name, []))]
+                    for name in result.blocks.get(file_path, [])
+                },
+            )
+        )
+
+    return TemplateGraph(block_overrides=block_overrides, dead_templates=dead_templates)
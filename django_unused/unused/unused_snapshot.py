@@ -0,0 +1,100 @@
+"""
+Compact snapshots of a run's unused items, for tracking them across runs.
+
+A snapshot is the sorted list of the unused items' IDs plus a hash of that list. Two snapshots are
+compared by one merge over their sorted lists; equal hashes skip even that.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+
+UNUSED_SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class UnusedSnapshot:
+    items: List[str]
+    digest: str
+
+
+@dataclass
+class SnapshotDiff:
+    added: List[str]
+    removed: List[str]
+
+
+def hash_items(items: List[str]) -> str:
+    return hashlib.sha256("\n".join(items).encode()).hexdigest()
+
+
+def build_unused_snapshot(item_ids: Iterable[str]) -> UnusedSnapshot:
+    items = sorted(set(item_ids))
+    return UnusedSnapshot(items=items, digest=hash_items(items))
+
+
+def get_template_id(file_path: str, base_dir: str) -> str:
+    """
+    Identifies a template by its path relative to the project, so that IDs match across checkouts.
+    """
+    return "template:" + os.path.relpath(file_path, base_dir).replace("\\", "/")
+
+
+def get_view_id(view: Any) -> str:
+    return f"view:{view.__module__}.{view.__qualname__}"
+
+
+def save_unused_snapshot(path: str, snapshot: UnusedSnapshot):
+    data = {"version": UNUSED_SNAPSHOT_VERSION, "hash": snapshot.digest, "items": snapshot.items}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=0)
+    os.replace(tmp_path, path)
+
+
+def load_unused_snapshot(path: str) -> Optional[UnusedSnapshot]:
+    """
+    Returns the snapshot stored at path, or None if there is none or it does not match its hash.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != UNUSED_SNAPSHOT_VERSION:
+        return None
+    items = data.get("items", [])
+    if hash_items(items) != data.get("hash"):
+        return None
+    return UnusedSnapshot(items=items, digest=data["hash"])
+
+
+def merge_sorted_diff(old: List[str], new: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Walks two sorted lists once.
+    :return: The items only in new, and the items only in old.
+    """
+    added: List[str] = []
+    removed: List[str] = []
+    i = j = 0
+    while i < len(old) and j < len(new):
+        if old[i] == new[j]:
+            i += 1
+            j += 1
+        elif old[i] < new[j]:
+            removed.append(old[i])
+            i += 1
+        else:
+            added.append(new[j])
+            j += 1
+    removed.extend(old[i:])
+    added.extend(new[j:])
+    return added, removed
+
+
+def compare_unused_snapshots(old: UnusedSnapshot, new: UnusedSnapshot) -> SnapshotDiff:
+    if old.digest == new.digest:
+        return SnapshotDiff(added=[], removed=[])
+    added, removed = merge_sorted_diff(old.items, new.items)
+    return SnapshotDiff(added=added, removed=removed)